@@ -1,7 +1,41 @@
 
 #analytics.py
-from datetime import datetime, timedelta,date
-from collections import Counter
+from datetime import date
+from functools import lru_cache
+from heapq import nlargest
+from itertools import tee
+from operator import itemgetter
+try:
+    from itertools import pairwise  # Python 3.10+
+except ImportError:
+    def pairwise(iterable):
+        """
+        Yield overlapping pairs (a, b), (b, c), ... of an iterable, like `itertools.pairwise`.
+
+        Args:
+            iterable (iterable): The values to pair up. May be a generator.
+
+        Returns:
+            iterator: Tuples of adjacent values.
+        """
+        first, second = tee(iterable)
+        next(second, None)
+        return zip(first, second)
+@lru_cache(maxsize=4096)
+def _parse_iso(date_string):
+    """
+    Parse a 'YYYY-MM-DD' string into a datetime.date, remembering the result.
+
+    The same completion dates are parsed again for every streak calculation, so repeated
+    dates are served from the cache. Invalid strings raise ValueError and are not cached.
+
+    Args:
+        date_string (str): The date in 'YYYY-MM-DD' format.
+
+    Returns:
+        datetime.date: The parsed date.
+    """
+    return date.fromisoformat(date_string)
 class HabitAnalyzer:
     def __init__(self, db):
         """
@@ -12,6 +46,21 @@ class HabitAnalyzer:
                                  perform database operations related to habits.
         """
         self.db = db
+        # Per-habit caches of attributes that only change when the habit is modified or removed
+        self._periodicity_cache = {}
+        self._creation_date_cache = {}
+    def invalidate_habit_cache(self, habit_name):
+        """
+        Drop the cached periodicity and creation date of a habit.
+
+        Must be called whenever a habit is modified or removed, so the next lookup
+        reads the current values from the database.
+
+        Args:
+            habit_name (str): The name of the habit whose cached values are dropped.
+        """
+        self._periodicity_cache.pop(habit_name, None)
+        self._creation_date_cache.pop(habit_name, None)
     def check_habit_exists(self, habit_name):
         """Checks if the habit already exists in the database."""
         return self.db.habit_exists(habit_name)
@@ -29,19 +78,16 @@ class HabitAnalyzer:
             return []
     def get_habit_description_and_periodicity(self, habit_name):
         """Retrieve and return the description and periodicity of a habit if found."""
-        try:
-            # Fetch habit metadata from the database
-            habit_metadata = self.db.fetch_habit_metadata(habit_name)
+        # Fetch habit metadata from the database
+        habit_metadata = self.db.fetch_habit_metadata(habit_name)
 
-            # Check if the result is None, indicating the habit was not found
-            if habit_metadata is not None:
-                return habit_metadata
-            else:
-                raise ValueError(f"Habit '{habit_name}' not found in the database.")
-        
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            return None
+        # Check if the result is None, indicating the habit was not found
+        if habit_metadata is None:
+            print(f"An error occurred: Habit '{habit_name}' not found in the database.")
+        else:
+            # Seed the periodicity cache so a following get_habit_periodicity_str needs no query
+            self._periodicity_cache[habit_name]=habit_metadata[1]
+        return habit_metadata
     def get_creation_date_of_habit(self,habit_name):
         """
         Retrieve the creation date of a specific habit.
@@ -49,8 +95,14 @@ class HabitAnalyzer:
         Args:
             habit_name (str): The name of the habit for which to retrieve the 
                               creation date.
+
+        The creation date is cached per habit after the first successful lookup.
         """
-        creation_date=self.db.get_creation_date_of_habit(habit_name)
+        creation_date=self._creation_date_cache.get(habit_name)
+        if creation_date is None:
+            creation_date=self.db.get_creation_date_of_habit(habit_name)
+            if creation_date is not None:
+                self._creation_date_cache[habit_name]=creation_date
         return creation_date 
     def check_tracking_records_of_habit_exists(self,habit_name):
         """
@@ -62,19 +114,13 @@ class HabitAnalyzer:
         Returns:
             list or None: A list of tracking records if they exist, 
                           or None if no records are found.
-
-        Raises:
-            Exception: If an error occurs while accessing the database.
         """
-        try:
-            records=self.db.get_tracking_records_of_habit(habit_name)
-            if records :
-                return records
-            else :
-                #there isnt any record
-                return None
-        except Exception as e:
-            print(f"An error occurred while check tracking records of habit exists : {e}")
+        records=self.db.get_tracking_records_of_habit(habit_name)
+        if records :
+            return records
+        else :
+            #there isnt any record
+            return None
     def remove_tracking_records_of_habit(self,habit_name):
         """
         Remove all tracking records for a specific habit.
@@ -83,17 +129,10 @@ class HabitAnalyzer:
             habit_name (str): The name of the habit for which to remove tracking records.
 
         Returns:
-            None: This method does not return any value.
+            int: The number of removed tracking records (0 if the habit had none).
         """
-        try:
-            records=self.check_tracking_records_of_habit_exists(habit_name)
-            if records :
-                self.db.delete_tracking_records_of_habit(habit_name)
-            else :
-                #there isnt any record
-                return None
-        except Exception as e:
-            print(f"An error occurred while remove tracking records of habit : {e}")
+        # Deleting is a no-op when the habit has no records, so no need to check first
+        return self.db.delete_tracking_records_of_habit(habit_name)
     def list_habit_names(self):
         """
         Retrieve a list of all habit names in the database.
@@ -118,10 +157,23 @@ class HabitAnalyzer:
             completion_date (str): The date of completion for the tracking record.
 
         Returns:
-            None: This method does not return any value.
+            bool: True if the tracking record was saved, False otherwise.
         """
         
-        self.db.insert_tracking_record(habit_name, completion_date)
+        return self.db.insert_tracking_record(habit_name, completion_date)
+    def add_new_tracking_records(self, tracking_records):
+        """
+        Add several tracking records at once, e.g. when importing or backfilling completions.
+
+        Args:
+            tracking_records (list of tuple): Pairs of (habit_name, completion_date).
+
+        Returns:
+            None: This method does not return any value.
+
+        `add_new_tracking_record` remains the method for adding a single record interactively.
+        """
+        self.db.insert_tracking_records(tracking_records)
     def list_all_tracking_records(self):#list
         """
         Retrieve a list of all tracking records from the database.
@@ -131,6 +183,17 @@ class HabitAnalyzer:
         """
         tracking_records = self.db.get_all_tracking_records()
         return tracking_records
+    def iter_all_tracking_records(self):
+        """
+        Iterate over all tracking records in the database, one record at a time.
+
+        Use this instead of `list_all_tracking_records` when the records are only
+        traversed once and do not need to be held in memory together.
+
+        Returns:
+            iterator of tuple: An iterator over all tracking records.
+        """
+        return self.db.iter_all_tracking_records()
     def list_tracking_records_of_habit(self, habit_name): #list of tuple
         """
         Retrieve tracking records for a specific habit.
@@ -165,27 +228,11 @@ class HabitAnalyzer:
         list of tuples
             A list of tuples where each tuple contains a habit name and the count of its completions.
             For example: [('dancing', 6), ('workout', 1)].
-
-        Raises:
-            Exception: If an error occurs while retrieving or processing data.
+            Returns None if no completions are found.
         """
-        try:
-            habit_completions_list_last_month=self.db.get_habit_completions_last_month()
-            if habit_completions_list_last_month is not None:
-                # Extract habit names from the list of completions
-                habit_names = [habit_name for habit_name, _ in habit_completions_list_last_month]
-                
-                # Count occurrences of each habit name
-                habit_counts = Counter(habit_names)
-                
-                # Convert the Counter object to a list of tuples
-                result = [(habit, count) for habit, count in habit_counts.items()]  #[('dancing', 6), ('workout', 1)]
-                return result
-            else:
-                return None
-        except Exception as e:
-            print(f"An error occurred while count habit completions last_month : {e}")
-    def sort_habits_by_count(self,habit_completions_list):
+        # The counting is done by a GROUP BY query in the database
+        return self.db.count_habit_completions_last_month() #[('dancing', 6), ('workout', 1)]
+    def sort_habits_by_count(self,habit_completions_list,top_k=None):
         """
         Sorts a list of tuples containing habit names and their counts in descending order based on the count.
 
@@ -193,6 +240,8 @@ class HabitAnalyzer:
         -----------
         habit_completions_list : list of tuples
             A list where each tuple contains a habit name and its count.
+        top_k : int, optional
+            If given, only the `top_k` habits with the highest counts are returned.
 
         Returns:
         --------
@@ -200,7 +249,10 @@ class HabitAnalyzer:
             A list of tuples sorted by count in descending order.
         """
         # Sort the list of tuples based on the second element (count) in descending order
-        sorted_habits = sorted(habit_completions_list, key=lambda x: x[1], reverse=True)
+        if top_k is not None:
+            # Keep only the top_k largest without sorting the whole list, ties in their original order
+            return nlargest(top_k, habit_completions_list, key=itemgetter(1))
+        sorted_habits = sorted(habit_completions_list, key=itemgetter(1), reverse=True)
         
         return sorted_habits
     def find_struggling_habits_last_month(self):
@@ -213,14 +265,11 @@ class HabitAnalyzer:
             A list of tuples containing the habit name and the number of missed completions,
             sorted by completion count.
         """
-        try:
-            count_habit_completions_last_month=self.count_habit_completions_last_month()
-            if count_habit_completions_last_month is not None:
-                return self.sort_habits_by_count(count_habit_completions_last_month)
-            else:
-                return None
-        except Exception as e:
-            print(f"An error occurred while find struggling habits last_month : {e}")
+        count_habit_completions_last_month=self.count_habit_completions_last_month()
+        if count_habit_completions_last_month is not None:
+            return self.sort_habits_by_count(count_habit_completions_last_month)
+        else:
+            return None
     def sort_dates_descending(self,date_list):
         """
         Sorts a list of date strings in descending order.
@@ -235,16 +284,10 @@ class HabitAnalyzer:
         list of str
             The sorted list of date strings with the latest dates first.
 
-        Raises:
-            ValueError: If any date string is in an invalid format.
+        'YYYY-MM-DD' strings sort chronologically as plain strings, so the dates
+        are not parsed.
         """
-        try:
-            # Convert date strings to datetime objects for sorting
-            sorted_dates = sorted(date_list, key=lambda date: datetime.strptime(date, '%Y-%m-%d'), reverse=True)
-            return sorted_dates
-        except ValueError as e:
-            print(f"Error parsing dates: {e}")
-            return []
+        return sorted(date_list, reverse=True)
     def get_habit_periodicity_str(self, habit_name):
         """
         Retrieve the periodicity of a specified habit.
@@ -259,28 +302,34 @@ class HabitAnalyzer:
         Raises:
             Exception: If there is an error accessing the database or 
                     if the habit is not found.
+
+        The periodicity is cached per habit after the first successful lookup.
         """
-        return self.db.get_habit_periodicity(habit_name)
-    def list_completion_dates_of_habit(self, habit_name):
+        periodicity=self._periodicity_cache.get(habit_name)
+        if periodicity is None:
+            periodicity=self.db.get_habit_periodicity(habit_name)
+            if periodicity is not None:
+                self._periodicity_cache[habit_name]=periodicity
+        return periodicity
+    def list_completion_dates_of_habit(self, habit_name, descending=False):
         """
         Retrieves and returns a list of completion dates for a given habit.
+
+        Args:
+            habit_name (str): The name of the habit.
+            descending (bool, optional): Return the most recent date first. Defaults to False.
         
         Returns:
         --------
         list of str:
-            A list of completion dates (strings) in 'YYYY-MM-DD' format, if they exist, otherwise None.
+            A list of completion dates (strings) in 'YYYY-MM-DD' format sorted by date, if they exist, otherwise None.
         """
-        try:
-            list_completion_dates = self.db.get_completion_dates_of_habit(habit_name)  # list of dates
-            
-            # If dates are found, return the list; otherwise, return None
-            if list_completion_dates:
-                return list_completion_dates
-            return None
-
-        except Exception as e:  # Generic exception handling for other errors
-            print(f"Unexpected error occurred: {e}")
-            return 0
+        list_completion_dates = self.db.get_completion_dates_of_habit(habit_name, descending)  # sorted list of dates
+        
+        # If dates are found, return the list; otherwise, return None
+        if list_completion_dates:
+            return list_completion_dates
+        return None
     def calculate_current_streak_for_daily_habit(self,list_completion_dates_of_habit_descending):
         """
         Calculate the current streak of daily completions for a habit.
@@ -294,13 +343,12 @@ class HabitAnalyzer:
                  Returns 0 if no valid streak is found or if there is an error in parsing dates.
         """
         try:
-            # Convert date strings to datetime objects
-            list_completion_dates_of_habit_descending = [datetime.strptime(date, '%Y-%m-%d') for date in list_completion_dates_of_habit_descending]
+            # Convert date strings to day ordinals, so consecutive days differ by exactly 1
+            day_ordinals = [_parse_iso(completion_date).toordinal() for completion_date in list_completion_dates_of_habit_descending]
             # Initialize streak variables
             current_streak = 1
-            period_delta=timedelta(days=1)
-            for i in range(1, len(list_completion_dates_of_habit_descending)):
-                if list_completion_dates_of_habit_descending[i-1] - list_completion_dates_of_habit_descending[i] == period_delta:
+            for previous_day, day in zip(day_ordinals, day_ordinals[1:]):
+                if previous_day - day == 1:
                     current_streak += 1
                 else:
                     break
@@ -319,40 +367,14 @@ class HabitAnalyzer:
         Returns:
             bool: True if the two dates fall in consecutive weeks, False otherwise.
 
-        Raises:
-            ValueError: If there is an issue while converting date strings to datetime objects.
+        Invalid date strings are reported and treated as not consecutive.
         """
         try:
-            # Convert strings to datetime.date if necessary
-            if isinstance(date1, str):
-                date1 = datetime.strptime(date1, "%Y-%m-%d").date()
-            if isinstance(date2, str):
-                date2 = datetime.strptime(date2, "%Y-%m-%d").date()
-
-            # Ensure date1 is earlier
-            if date1 > date2:
-                date1, date2 = date2, date1
-
-            # Get ISO calendar info for both dates
-            year1, week1, _ = date1.isocalendar()
-            year2, week2, _ = date2.isocalendar()
-
-            # Check if weeks are consecutive within the same year
-            if year1 == year2:
-                return week2 - week1 == 1
-
-            # Handle consecutive weeks across years
-            if year2 - year1 == 1:  # Check if the years are consecutive
-                last_week_of_year1 = date(year1, 12, 28).isocalendar()[1]
-                return week1 == last_week_of_year1 and week2 == 1
-
-            return False
+            # Consecutive ISO weeks have week ordinals that differ by exactly 1, also across years
+            return abs(self.get_week_ordinal(date1) - self.get_week_ordinal(date2)) == 1
         except ValueError as ve:
             print(f"ValueError: {ve}")
             return False
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            return False
     def are_in_same_week(self,date1_str, date2_str):
         """
         Check if two given dates fall within the same week of the year.
@@ -366,19 +388,30 @@ class HabitAnalyzer:
             None: Returns None if either date is invalid.
         """
         try:
-            # Convert input strings to datetime objects
-            date1 = datetime.strptime(date1_str, '%Y-%m-%d')
-            date2 = datetime.strptime(date2_str, '%Y-%m-%d')
+            # Dates in the same ISO week share the same week ordinal
+            return self.get_week_ordinal(date1_str) == self.get_week_ordinal(date2_str)
         except ValueError:
             return None  # Return None if a date is invalid
-        # Get the week number and year for both dates
-        week1 = date1.isocalendar()[1]  # Week number for date1
-        year1 = date1.isocalendar()[0]  # Year for date1
-        week2 = date2.isocalendar()[1]  # Week number for date2
-        year2 = date2.isocalendar()[0]  # Year for date2
-
-        # Check if both dates are in the same week and year
-        return week1 == week2 and year1 == year2
+    def get_week_ordinal(self, completion_date):
+        """
+        Return the number of the ISO week (Monday to Sunday) a date falls in, counted from 0001-01-01.
+
+        Dates in the same ISO week share the same ordinal and consecutive weeks differ by 1,
+        including across year boundaries.
+
+        Args:
+            completion_date (str or datetime.date): The date in 'YYYY-MM-DD' format or datetime.date.
+
+        Returns:
+            int: The week ordinal of the date.
+
+        Raises:
+            ValueError: If the date string is in an invalid format.
+        """
+        if isinstance(completion_date, str):
+            completion_date = _parse_iso(completion_date)
+        # 0001-01-01 is a Monday and has day ordinal 1
+        return (completion_date.toordinal() - 1) // 7
     def calculate_current_streak_for_weekly_habit(self,list_completion_dates_of_habit_descending):
         """
         Calculate the current streak of weekly completions for a habit.
@@ -390,22 +423,35 @@ class HabitAnalyzer:
             int: The current streak of weekly completions. Returns 0 if an error occurs.
         """
         try:
-            
-            # Initialize streak variables
-            current_streak = 1
-            for i in range(1, len(list_completion_dates_of_habit_descending)):
-                if self.are_dates_in_consecutive_weeks(list_completion_dates_of_habit_descending[i-1],list_completion_dates_of_habit_descending[i]):
-                    current_streak += 1
-                    
-                elif self.are_in_same_week(list_completion_dates_of_habit_descending[i-1],list_completion_dates_of_habit_descending[i]):
-                    
-                    continue
-                else:
-                    break
-            return current_streak   
+            # Convert each date to its week ordinal once
+            week_ordinals = [self.get_week_ordinal(completion_date) for completion_date in list_completion_dates_of_habit_descending]
+            return self.calculate_current_streak_from_week_ordinals(week_ordinals)
         except ValueError as e:
             print(f"Error parsing list completion dates of habit descending: {e}")
             return 0
+    def calculate_current_streak_from_week_ordinals(self, week_ordinals_descending):
+        """
+        Calculate the current streak of weekly completions from week ordinals.
+
+        Args:
+            week_ordinals_descending (iterable of int): The week ordinals (see `get_week_ordinal`)
+                of the completion dates, sorted in descending order. May be a generator.
+
+        Returns:
+            int: The current streak of weekly completions.
+        """
+        # Initialize streak variables
+        current_streak = 1
+        for previous_week, week in pairwise(week_ordinals_descending):
+            # Consecutive weeks
+            if abs(previous_week - week) == 1:
+                current_streak += 1
+            # Same week, continue the streak
+            elif previous_week == week:
+                continue
+            else:
+                break
+        return current_streak
     def get_current_streak_for_habit(self, habit_name):
         """
         Calculate the current streak of completions for a given habit.
@@ -417,13 +463,17 @@ class HabitAnalyzer:
             int: The current streak of completions for the habit. Returns 0 if no completions are recorded.
         """
         periodicity_str=self.get_habit_periodicity_str(habit_name)
-        list_completion_dates_of_habit=self.list_completion_dates_of_habit(habit_name)
-        list_completion_dates_of_habit_descending= self.sort_dates_descending(list_completion_dates_of_habit)
 
         if periodicity_str=="daily":
-            return self.calculate_current_streak_for_daily_habit(list_completion_dates_of_habit_descending)
+            # Daily streaks are calculated inside the database
+            return self.db.get_current_daily_streak(habit_name)
         if periodicity_str=="weekly":
-            return self.calculate_current_streak_for_weekly_habit(list_completion_dates_of_habit_descending)
+            # The database returns integer day ordinals already sorted from most recent to oldest
+            day_ordinals=self.db.get_completion_ordinals_of_habit(habit_name, descending=True)
+            if not day_ordinals:
+                return 0
+            # 0001-01-01 is a Monday and has day ordinal 1
+            return self.calculate_current_streak_from_week_ordinals((day - 1) // 7 for day in day_ordinals)
     def calculate_longest_streak_for_daily_habit(self,list_completion_dates_of_habit_ascending):
         """
         Calculate the longest streak of daily completions for a given habit.
@@ -435,19 +485,16 @@ class HabitAnalyzer:
             int: The longest streak of daily completions. Returns 0 if an error occurs.
         """
         try:
-            # Convert date strings to datetime objects
-            list_completion_dates_of_habit_ascending = [datetime.strptime(date, '%Y-%m-%d') for date in list_completion_dates_of_habit_ascending]
-            
-            # Define the timedelta based on periodicity
-            period_delta = timedelta(days=1)
+            # Convert date strings to day ordinals lazily, so consecutive days differ by exactly 1
+            day_ordinals = (_parse_iso(completion_date).toordinal() for completion_date in list_completion_dates_of_habit_ascending)
             
             # Initialize streak variables
             current_streak = 1
             max_streak = 1
             
-            # Calculate the current streak
-            for i in range(1, len(list_completion_dates_of_habit_ascending)):
-                if list_completion_dates_of_habit_ascending[i] - list_completion_dates_of_habit_ascending[i-1] == period_delta:
+            # Calculate the current streak in a single pass over adjacent pairs
+            for previous_day, day in pairwise(day_ordinals):
+                if day - previous_day == 1:
                     current_streak += 1
                 else:
                     max_streak = max(max_streak, current_streak)
@@ -473,35 +520,50 @@ class HabitAnalyzer:
         Raises:
             ValueError: If there is an issue with parsing the list of completion dates.
 
-        This method iterates through the list of completion dates to determine the longest 
-        streak of consecutive weeks during which the habit was completed. It uses helper methods 
-        `are_dates_in_consecutive_weeks` and `are_in_same_week` to determine the relationship between 
-        consecutive dates.
+        This method converts each completion date once with `get_week_ordinal` and hands the
+        week ordinals to `calculate_longest_streak_from_week_ordinals`.
         """
         try:
-            
-            # Initialize streak variables
-            current_streak = 1
-            max_streak=1
-            for i in range(1, len(list_completion_dates_of_habit_ascending)):
-                # Check if two dates are in consecutive weeks
-                if self.are_dates_in_consecutive_weeks(list_completion_dates_of_habit_ascending[i],list_completion_dates_of_habit_ascending[i-1]):
-                    current_streak += 1
-                # If they are in the same week, continue the streak    
-                elif self.are_in_same_week(list_completion_dates_of_habit_ascending[i],list_completion_dates_of_habit_ascending[i-1]):  
-                    continue
-                else:
-                    # If no longer in consecutive weeks, update max streak and reset current streak
-                    if current_streak > max_streak:
-                        max_streak=current_streak
-                        current_streak=1
-            # Return the longest streak found
-            if current_streak> max_streak:
-                max_streak=current_streak  
-            return max_streak   
+            # Convert each date to its week ordinal once
+            week_ordinals = [self.get_week_ordinal(completion_date) for completion_date in list_completion_dates_of_habit_ascending]
+            return self.calculate_longest_streak_from_week_ordinals(week_ordinals)
         except ValueError as e:
             print(f"Error parsing list completion dates of habit ascending: {e}")
             return 0
+    def calculate_longest_streak_from_week_ordinals(self, week_ordinals_ascending):
+        """
+        Calculate the longest streak of weekly completions from week ordinals.
+
+        Args:
+            week_ordinals_ascending (iterable of int): The week ordinals (see `get_week_ordinal`)
+                of the completion dates, sorted in ascending order. May be a generator.
+
+        Returns:
+            int: The longest streak of weekly completions.
+
+        This method iterates through the week ordinals to determine the longest streak of
+        consecutive weeks during which the habit was completed. Completions in the same week
+        continue the streak.
+        """
+        # Initialize streak variables
+        current_streak = 1
+        max_streak=1
+        for previous_week, week in pairwise(week_ordinals_ascending):
+            # Check if two dates are in consecutive weeks
+            if abs(week - previous_week) == 1:
+                current_streak += 1
+            # If they are in the same week, continue the streak    
+            elif week == previous_week:  
+                continue
+            else:
+                # If no longer in consecutive weeks, update max streak and reset current streak
+                if current_streak > max_streak:
+                    max_streak=current_streak
+                    current_streak=1
+        # Return the longest streak found
+        if current_streak> max_streak:
+            max_streak=current_streak  
+        return max_streak   
     def get_longest_streak_for_given_habit(self, habit_name):    
         """
         Calculate the longest streak of completions for a given habit.
@@ -517,28 +579,52 @@ class HabitAnalyzer:
         Raises:
             ValueError: If there is an issue with processing the data.
 
-        This method retrieves the periodicity of the given habit and the list of completion dates, 
-        sorts the completion dates, and calculates the longest streak based on the habit's periodicity 
-        (either 'daily' or 'weekly').
+        This method retrieves the periodicity of the given habit and calculates the longest streak
+        based on it: daily streaks are calculated inside the database, weekly streaks are calculated
+        from the integer day ordinals of the completion dates.
         """
         try:
             periodicity_str=self.get_habit_periodicity_str(habit_name)
-            list_completion_dates_of_habit=self.list_completion_dates_of_habit(habit_name)
-            # If there are no completion dates for the habit
-            if list_completion_dates_of_habit :
-                # Sort the completion dates in ascending order
-                list_completion_dates_of_habit_ascending = sorted(list_completion_dates_of_habit)
-                # Calculate the longest streak based on the periodicity
-                if periodicity_str == "daily":
-                    return self.calculate_longest_streak_for_daily_habit(list_completion_dates_of_habit_ascending)
-                elif periodicity_str =="weekly":
-                    return self.calculate_longest_streak_for_weekly_habit(list_completion_dates_of_habit_ascending)
-            else:
-                return 0 # Return 0 if there are no completion dates or the habit doesn't exist
+            if periodicity_str == "daily":
+                return self.db.get_longest_daily_streak(habit_name)
+            elif periodicity_str =="weekly":
+                # The database returns integer day ordinals already sorted in ascending order
+                day_ordinals=self.db.get_completion_ordinals_of_habit(habit_name)
+                # If there are no completion dates for the habit
+                if day_ordinals :
+                    # 0001-01-01 is a Monday and has day ordinal 1
+                    return self.calculate_longest_streak_from_week_ordinals((day - 1) // 7 for day in day_ordinals)
+            return 0 # Return 0 if there are no completion dates or the habit doesn't exist
         except ValueError as e:
             print(f"Error : {e}")
             return 0
-    def sort_habits_by_max_streak(self,habit_streak_list):
+    def get_habit_stats(self, habit_name):
+        """
+        Calculate both the current and the longest streak of a habit.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            tuple: (current_streak, longest_streak) for the habit.
+                Returns (0, 0) if no completions are recorded or the habit does not exist.
+
+        Daily streaks come from the same SQL queries as `get_current_streak_for_habit` and
+        `get_longest_streak_for_given_habit`. For weekly habits the day ordinals are fetched
+        once and both streaks are calculated from the same week ordinals.
+        """
+        periodicity_str=self.get_habit_periodicity_str(habit_name)
+        if periodicity_str == "daily":
+            return self.db.get_current_daily_streak(habit_name), self.db.get_longest_daily_streak(habit_name)
+        if periodicity_str == "weekly":
+            day_ordinals=self.db.get_completion_ordinals_of_habit(habit_name)
+            if day_ordinals:
+                # 0001-01-01 is a Monday and has day ordinal 1
+                week_ordinals_ascending=[(day - 1) // 7 for day in day_ordinals]
+                return (self.calculate_current_streak_from_week_ordinals(reversed(week_ordinals_ascending)),
+                        self.calculate_longest_streak_from_week_ordinals(week_ordinals_ascending))
+        return 0, 0
+    def sort_habits_by_max_streak(self,habit_streak_list,top_k=None):
         """
         Sorts a list of habits based on the maximum streak in descending order.
 
@@ -546,6 +632,8 @@ class HabitAnalyzer:
         -----------
         habit_streak_list : list of tuples
             List of tuples where each tuple contains (habit_name, max_streak).
+        top_k : int, optional
+            If given, only the `top_k` habits with the longest streaks are returned.
 
         Returns:
         --------
@@ -553,7 +641,10 @@ class HabitAnalyzer:
             The sorted list based on max streak in descending order.
         """
         # Sort the list by the second element (max streak) in descending order
-        return sorted(habit_streak_list, key=lambda x: x[1], reverse=True)
+        if top_k is not None:
+            # Keep only the top_k largest without sorting the whole list, ties in their original order
+            return nlargest(top_k, habit_streak_list, key=itemgetter(1))
+        return sorted(habit_streak_list, key=itemgetter(1), reverse=True)
     def calculate_longest_run_streak_of_all_defined_habits(self):
         """
         Calculates the longest run streak for all defined habits.
@@ -564,15 +655,28 @@ class HabitAnalyzer:
             A list of habits and their longest streaks, sorted by the streak in descending order.
             Returns None if no habits are found or there is an error.
 
-        This method retrieves all defined habits, calculates the longest streak for each habit,
-        and returns a list sorted by the longest streak in descending order.
+        This method fetches the periodicities of all habits, their daily streaks (calculated
+        inside the database like `get_longest_streak_for_given_habit` does) and their completion
+        dates in three bulk queries, calculates the weekly streaks in memory, and returns a list
+        sorted by the longest streak in descending order.
         """
         try:
-            habits=self.list_habit_names()# Get the list of all habits
-            if habits :
-                # Calculate the longest run streak for each habit
-                list_all_habits_long_streak = [
-                (habit, self.get_longest_streak_for_given_habit(habit)) for habit in habits]
+            habit_periodicities=self.db.get_all_habit_periodicities()# Get all habits with their periodicity
+            if habit_periodicities :
+                longest_daily_streaks=self.db.get_longest_daily_streaks()# Daily streak of every habit with completions
+                all_completion_dates=self.db.get_all_completion_dates()# Completion dates of all habits, ascending
+                list_all_habits_long_streak = []
+                for habit, periodicity_str in habit_periodicities.items():
+                    list_completion_dates_of_habit_ascending=all_completion_dates.get(habit)
+                    if not list_completion_dates_of_habit_ascending:
+                        longest_streak = 0 # No completion dates for this habit
+                    elif periodicity_str == "daily":
+                        longest_streak = longest_daily_streaks.get(habit, 0)
+                    elif periodicity_str == "weekly":
+                        longest_streak = self.calculate_longest_streak_for_weekly_habit(list_completion_dates_of_habit_ascending)
+                    else:
+                        longest_streak = None
+                    list_all_habits_long_streak.append((habit, longest_streak))
                 return self.sort_habits_by_max_streak(list_all_habits_long_streak)
             else:
                 return None # Return None if no habits exist
@@ -5,7 +5,50 @@ from .database import HabitTrackerDB
 from .analytics import HabitAnalyzer
 import os
 import platform
-from tabulate import tabulate
+import sys
+
+CLEAR_SCREEN_ANSI = "\x1b[2J\x1b[H" # Clear the screen and move the cursor to the top left corner
+PERIODICITY_CHOICES = [
+    {"name": "Daily", "value": "daily"},
+    {"name": "Weekly", "value": "weekly"}
+]
+def format_grid(rows, headers):
+    """
+    Format rows as a grid table for display.
+
+    tabulate is imported on first use instead of at module import, since it is
+    only needed once a table is shown and noticeably adds to CLI startup time.
+
+    Args:
+        rows (list): The table rows.
+        headers (list): The column headers.
+
+    Returns:
+        str: The table in tabulate's 'grid' format.
+    """
+    from tabulate import tabulate
+    return tabulate(rows, headers=headers, tablefmt='grid')
+def parse_date(date_string):
+    """
+    Parse a date given strictly in YYYY-MM-DD format.
+
+    `date.fromisoformat` also accepts other ISO 8601 forms on Python 3.11+ (e.g. '20250113'
+    or '2025-W03-1'). Those are rejected, so only canonical dates are stored and compared
+    by the date queries.
+
+    Args:
+        date_string (str): The date in YYYY-MM-DD format.
+
+    Returns:
+        date: The parsed date.
+
+    Raises:
+        ValueError: If the string is not a valid date in YYYY-MM-DD format.
+    """
+    parsed_date = date.fromisoformat(date_string)
+    if parsed_date.isoformat() != date_string:
+        raise ValueError(f"Invalid date '{date_string}', expected the format YYYY-MM-DD")
+    return parsed_date
 class UserInterface:
     """
     A command-line interface (CLI) for managing and analyzing habits in the Habit Tracker application.
@@ -16,23 +59,21 @@ class UserInterface:
         habit_db (HabitTrackerDB): Instance of the HabitTrackerDB for habit data management.
         analytics (HabitAnalyzer): Instance of HabitAnalyzer for analyzing habit data.
     """
-    def __init__(self, db=HabitTrackerDB()):
+    def __init__(self, db=None):
         """
         Initialize the UserInterface class with a HabitTrackerDB instance.
 
         Args:
-            db (HabitTrackerDB): The database instance to manage habits and records. Defaults to HabitTrackerDB().
+            db (HabitTrackerDB, optional): The database instance to manage habits and records.
+                Defaults to None, in which case a new HabitTrackerDB() is created.
         """
-        self.habit_db = db
+        # Created here rather than as a default argument, which would open the database at import time
+        self.habit_db = db if db is not None else HabitTrackerDB()
         self.analytics = HabitAnalyzer(self.habit_db)
-    def display_menu(self):
-        
-        """
-        Display the main menu and execute the selected option.
-        Presents the user with a list of options related to habit management and tracking.
-        The selected option triggers the corresponding method.
-        """
-        menu_choices =[
+        self._habit_names_cache = None # Loaded on first use, kept in sync by add_habit/remove_habit
+        self._completion_dates_cache = {} # habit name -> set of completion dates (date objects)
+        # Menu choices are built once; their values are bound methods of this instance
+        self._main_menu_choices =[
             {"name": "Create New Habit", "value": self.add_habit},
             {"name": "Modify an Existing Habit", "value": self.modify_habit},
             {"name": "Remove a Habit", "value": self.remove_habit},
@@ -47,22 +88,40 @@ class UserInterface:
             {"name": "Show Longest Run Streak Among All Defined Habits", "value": self.show_longest_run_streak_of_all_habits},
             {"name": "Exit", "value": self.exit_program}
         ]
-
+        self._final_menu_choices =[
+            {"name": "Back to Main Menu", "value": self.clear_screen },
+            {"name": "Exist", "value": self.exit_program}
+        ]
+        self._date_choices=[
+            {"name": "Today", "value": self.get_today_date},
+            {"name": "Custom Date", "value": self.get_valid_date}
+            ]
+    def display_menu(self):
+        
+        """
+        Display the main menu and execute the selected option.
+        Presents the user with a list of options related to habit management and tracking.
+        The selected option triggers the corresponding method.
+        """
         # Use questionary to display the menu and get the user's choice
-        choice = questionary.select("Please Choose an option:", choices=menu_choices).ask()
+        choice = questionary.select("Please Choose an option:", choices=self._main_menu_choices).ask()
         # Call the corresponding method for the selected choice
         if choice:
             choice()
     def clear_screen(self):
         """
         Clears the terminal screen based on the operating system.
+
+        On Unix-based systems the ANSI escape sequence is written directly instead of
+        starting a `clear` subprocess on every return to the main menu.
         """
-        # Get the operating system name
+        # Get the operating system name (platform caches it after the first call)
         os_name = platform.system()
         if os_name == "Windows":
-            os.system('cls')  # For Windows
+            os.system('cls')  # For Windows, whose legacy console does not understand ANSI escapes
         else:
-            os.system('clear')  # For Unix-based systems
+            sys.stdout.write(CLEAR_SCREEN_ANSI)  # For Unix-based systems
+            sys.stdout.flush()
     def ensure_lowercase(self,value):
         """
         Convert the input value to lowercase if it's a string.
@@ -77,7 +136,7 @@ class UserInterface:
         if isinstance(value, str):
             return value.lower()
         return value
-    def get_limited_length_input(self,value,prompt,max_length):
+    def get_limited_length_input(self,value,prompt,max_length,lowercase=False):
         """
         Validate user input to ensure it meets length restrictions.
 
@@ -85,6 +144,7 @@ class UserInterface:
             value (str): The initial input value.
             prompt (str): The prompt message for the user.
             max_length (int): Maximum allowed length for the input.
+            lowercase (bool, optional): Return the accepted input in lowercase. Defaults to False.
 
         Returns:
             str: A valid user input.
@@ -98,10 +158,23 @@ class UserInterface:
                 print(f"this is too long. Please enter shorter than {max_length} characters.")
                 value = questionary.text(prompt).ask()
             else:
-                return user_input
+                return self.ensure_lowercase(user_input) if lowercase else user_input
+    def get_habit_names(self):
+        """
+        Return the names of all habits, loading them from the database only once.
+
+        The names are kept in a dict (insertion ordered, O(1) membership) that add_habit
+        and remove_habit update, so later lookups do not query the database.
+
+        Returns:
+            dict: The habit names as keys, in the order they were created.
+        """
+        if self._habit_names_cache is None:
+            self._habit_names_cache = dict.fromkeys(self.analytics.list_habit_names() or [])
+        return self._habit_names_cache
     def ensure_habit_exists(self, habit_name):
         """
-        Check if the habit exists in the database.
+        Check if the habit exists, using the cached habit names.
 
         Args:
             habit_name (str): The name of the habit to check.
@@ -109,7 +182,7 @@ class UserInterface:
         Returns:
             bool: True if the habit exists, False otherwise.
         """
-        return self.analytics.check_habit_exists(habit_name)
+        return habit_name in self.get_habit_names()
     def get_valid_habit_name(self):
         """
         Prompt the user for a valid habit name that doesn't already exist in the database.
@@ -118,12 +191,13 @@ class UserInterface:
             str: A unique habit name.
         """
         max_length=25
-        name = self.ensure_lowercase(self.get_limited_length_input(questionary.text(f"Enter the name of the habit shorter than {max_length} characters:").ask(),"Enter the name of the habit again:",max_length))
-        
-        while self.ensure_habit_exists(name.strip()):
+        prompt=f"Enter the name of the habit shorter than {max_length} characters:"
+        while True:
+            # The returned name is already stripped and lowercased
+            name = self.get_limited_length_input(questionary.text(prompt).ask(),"Enter the name of the habit again:",max_length,lowercase=True)
+            if not self.ensure_habit_exists(name):
+                return name
             print(f"{name} is already added,please type new name.")
-            name = self.ensure_lowercase(self.get_limited_length_input(questionary.text(f"Enter the name of the habit shorter than {max_length} characters:").ask(),"Enter the name of the habit again:",max_length))
-        return name
     def get_description(self):
         """
         Prompt the user for a non-empty description of the habit.
@@ -140,11 +214,7 @@ class UserInterface:
         Returns:
             str: The selected periodicity ('daily' or 'weekly').
         """
-        periodicity_choices=[
-            {"name": "Daily", "value": "daily"},
-            {"name": "Weekly", "value": "weekly"}
-            ]
-        return questionary.select("Please Choose a periodicity: ", choices=periodicity_choices).ask()
+        return questionary.select("Please Choose a periodicity: ", choices=PERIODICITY_CHOICES).ask()
     def get_today_date(self):
         """
         Return today's date in YYYY-MM-DD format.
@@ -158,7 +228,7 @@ class UserInterface:
         Prompt the user to input a date, validate the input, and return it in YYYY-MM-DD format.
 
         This function continuously prompts the user to enter a date in the format YYYY-MM-DD.
-        It uses the `date.fromisoformat` method to validate the input. If the input is valid,
+        It uses `parse_date` to validate the input. If the input is valid,
         the date is returned as a string in the format YYYY-MM-DD. If the input is invalid,
         the user is prompted to enter the date again until a valid date is provided.
 
@@ -174,7 +244,7 @@ class UserInterface:
             
             try:
                 # Try to parse the date input into a date object
-                valid_date = date.fromisoformat(user_input)
+                valid_date = parse_date(user_input)
                 # Return the date in YYYY-MM-DD format
                 return valid_date.strftime('%Y-%m-%d')
             except ValueError:
@@ -187,11 +257,7 @@ class UserInterface:
         Returns:
             str: The current date as a string in the format YYYY-MM-DD.
         """
-        date_choices=[
-            {"name": "Today", "value": self.get_today_date},
-            {"name": "Custom Date", "value": self.get_valid_date}
-            ]
-        date = questionary.select(prompt, choices=date_choices).ask()
+        date = questionary.select(prompt, choices=self._date_choices).ask()
         return date()
     def get_valid_time(self):
         """
@@ -225,14 +291,14 @@ class UserInterface:
         """
         try:
             # Convert the input strings to date objects
-            creation_date = datetime.strptime(creation_date, '%Y-%m-%d').date()
-            completion_date = datetime.strptime(completion_date, '%Y-%m-%d').date()
+            creation_date = parse_date(creation_date)
+            completion_date = parse_date(completion_date)
             
             # Ensure the completion date is after the creation date
             while creation_date > completion_date:
                 print(f"Invalid date: Completion Date {completion_date} should be after Creation Date {creation_date}.")
                 completion_date=self.get_date("Enter completion date ")
-                completion_date = datetime.strptime(completion_date, '%Y-%m-%d').date()
+                completion_date = parse_date(completion_date)
             return completion_date  # Return the valid dates object
         
         except ValueError as e:
@@ -249,13 +315,17 @@ class UserInterface:
 
         Returns:
             bool: True if the date exists, False otherwise.
+
+        The completion dates of each habit are fetched and parsed once and kept in a set
+        of date objects, which add_tracking_record and the removal of tracking records
+        keep up to date.
         """
         try:
-            completion_dates_of_habit=self.analytics.list_completion_dates_of_habit(habit_name)
-            if completion_dates_of_habit is not None:
-                return completion_date.strftime('%Y-%m-%d') in completion_dates_of_habit
-            else:
-                return False
+            completion_dates_of_habit=self._completion_dates_cache.get(habit_name)
+            if completion_dates_of_habit is None:
+                completion_dates_of_habit={date.fromisoformat(completion) for completion in self.analytics.list_completion_dates_of_habit(habit_name) or []}
+                self._completion_dates_cache[habit_name]=completion_dates_of_habit
+            return completion_date in completion_dates_of_habit
 
         except Exception as e:
             print(f"An error occurred while in is_date_in_completion_dates function: {e}")
@@ -270,13 +340,12 @@ class UserInterface:
             date: A valid completion date.
         """
         try:
-            completion_date =self.check_dates(self.analytics.get_creation_date_of_habit(habit_name),self.get_date("Enter completion date "))
-        
-            while self.is_date_in_completion_dates(habit_name,completion_date):
+            creation_date=self.analytics.get_creation_date_of_habit(habit_name) # Fetched once for all retries
+            while True:
+                completion_date =self.check_dates(creation_date,self.get_date("Enter completion date "))
+                if not self.is_date_in_completion_dates(habit_name,completion_date):
+                    return completion_date
                 print(f"The date {completion_date} is already Saved. Please enter a different date:")
-                completion_date=self.get_valid_completion_date(habit_name)
-        
-            return completion_date
         except Exception as e:
             print(f"An error occurred while in get_valid_completion_date function: {e}")
     def select_habit_name(self):
@@ -286,15 +355,11 @@ class UserInterface:
         Returns:
             str: The selected habit name, or None if no habits are available.
         """
-        habits=self.analytics.list_habit_names()
+        habits=list(self.get_habit_names())
         try:
-            # Check if habits is None or an empty list
-            if habits is None:
-                print("No habits found. Please create a habit first.")
-                return None
-            
+            # Check if there are no habits
             if not habits:
-                print("No habits available for selection.")
+                print("No habits found. Please create a habit first.")
                 return None
             response = questionary.select(
                 "Select your habit name:",
@@ -313,11 +378,7 @@ class UserInterface:
         """
         Display a menu with options to return to the main menu or exit the program.
         """
-        menu_choices =[
-            {"name": "Back to Main Menu", "value": self.clear_screen },
-            {"name": "Exist", "value": self.exit_program}
-        ]
-        choice = questionary.select("Please Choose an option:", choices=menu_choices).ask()
+        choice = questionary.select("Please Choose an option:", choices=self._final_menu_choices).ask()
 
         # Call the corresponding method for the selected choice
         if choice:
@@ -336,8 +397,12 @@ class UserInterface:
         creation_time=self.get_valid_time() # Get the creation time
         # Create a new Habit instance and add it
         habit = Habit(name, description, periodicity, creation_date,creation_time,self.habit_db)
-        habit.add_habit()
-        print("Habit added successfully!")
+        if habit.add_habit():
+            # Only cache the name once the habit is actually stored
+            self.get_habit_names()[name] = None
+            print("Habit added successfully!")
+        else:
+            print(f"The habit '{name}' could not be added.")
         self.final_menu()
     def modify_habit(self):
         """
@@ -352,40 +417,42 @@ class UserInterface:
             if habit_name is not None:
                 # Prompt user for new details
                 description, periodicity = self.analytics.get_habit_description_and_periodicity(habit_name)
+                old_periodicity = periodicity # Reuse the fetched row instead of querying it again
                 
                 # Ask the user if they want to modify each field
                 if questionary.confirm("Do you want to change the description?").ask():
                     description = self.get_description()
                 
+                remove_records=False
                 if questionary.confirm("Do you want to change the periodicity?").ask():
                     periodicity = self.get_periodicity()
-                    old_periodicity=self.analytics.get_habit_periodicity_str(habit_name)
                     # Handle changes in periodicity and associated tracking records
                     if periodicity != old_periodicity:
-                        records=self.analytics.check_tracking_records_of_habit_exists(habit_name)
-                        if records:
-                            print(f"Found {len(records)} tracking records for habit '{habit_name}' Because you changed the periodicity Previous tracking records should be deleted. Deleting now...")
-                            self.analytics.remove_tracking_records_of_habit(habit_name)
+                        remove_records=True # Previous tracking records no longer fit the new periodicity
+                    else: 
+                        # Optional: Remove old tracking records even if periodicity didn't change
+                        remove_records = questionary.confirm(f"Although the periodicity of '{habit_name}' did not change, Do you want to remove previous tracking records of '{habit_name}'?").ask()
+
+                # Update the habit and remove its tracking records in a single transaction,
+                # after all questions are answered so no prompt waits inside it
+                habit = Habit(habit_name, description, periodicity, creation_date=None, creation_time=None, database=self.habit_db)
+                with self.habit_db.transaction():
+                    deleted=self.analytics.remove_tracking_records_of_habit(habit_name) if remove_records else 0
+                    habit.modify_habit()
+                self.analytics.invalidate_habit_cache(habit_name)
+                if remove_records:
+                    self._completion_dates_cache.pop(habit_name, None)
+                    if periodicity != old_periodicity:
+                        if deleted:
+                            print(f"Found {deleted} tracking records for habit '{habit_name}' Because you changed the periodicity Previous tracking records should be deleted.")
                             print("Tracking records deleted successfully.")
-                            #removed Tracking
                         else:
                             print(f"Because you changed the periodicity Previous tracking records should be deleted but There wasnt any Previous tracking records for '{habit_name}'  habit!")
-                    else: 
-                        # Optional: Remove old tracking records even if periodicity didn't change
-                        confirmation = questionary.confirm(f"Although the periodicity of '{habit_name}' did not change, Do you want to remove previous tracking records of '{habit_name}'?").ask()
-                        if confirmation:
-                            records=self.analytics.check_tracking_records_of_habit_exists(habit_name)
-                            if records:
-                                print(f"Found {len(records)} tracking records for habit '{habit_name}'. Deleting now...")
-                                self.analytics.remove_tracking_records_of_habit(habit_name)
-                                print("Tracking records deleted successfully.")
-                                #removed Tracking
-                            else:
-                                print(f"There wasnt any Previous tracking records for '{habit_name}' habit!")
-
-                # Update the habit
-                habit = Habit(habit_name, description, periodicity, creation_date=None, creation_time=None)
-                habit.modify_habit()
+                    elif deleted:
+                        print(f"Found {deleted} tracking records for habit '{habit_name}'.")
+                        print("Tracking records deleted successfully.")
+                    else:
+                        print(f"There wasnt any Previous tracking records for '{habit_name}' habit!")
                 print("Habit modified successfully!")
         except Exception as e:
             print(f"An error occurred while modifying the habit: {e}")
@@ -402,13 +469,18 @@ class UserInterface:
             if habit_name is not None:
                 confirmation = questionary.confirm(f"Are you sure you want to remove habit '{habit_name}'?").ask()
                 if confirmation:
-                        habit = Habit(habit_name, description=None, periodicity=None, creation_date=None, creation_time=None)
-                        habit.remove_habit()
-
-                        records=self.analytics.check_tracking_records_of_habit_exists(habit_name)
-                        if records:
-                            print(f"Found {len(records)} tracking records for habit '{habit_name}'. Deleting now...")
-                            self.analytics.remove_tracking_records_of_habit(habit_name)
+                        habit = Habit(habit_name, description=None, periodicity=None, creation_date=None, creation_time=None, database=self.habit_db)
+                        # Remove the tracking records and then the habit in a single transaction.
+                        # Deleting the records first counts them and satisfies the foreign key
+                        # in databases created before it cascaded.
+                        with self.habit_db.transaction():
+                            deleted=self.analytics.remove_tracking_records_of_habit(habit_name)
+                            habit.remove_habit()
+                        self.analytics.invalidate_habit_cache(habit_name)
+                        self.get_habit_names().pop(habit_name, None)
+                        self._completion_dates_cache.pop(habit_name, None)
+                        if deleted:
+                            print(f"Found {deleted} tracking records for habit '{habit_name}'.")
                             print("Tracking records deleted successfully.")
                             #removed Tracking
                         else:
@@ -430,9 +502,13 @@ class UserInterface:
             habit_name=self.select_habit_name()
             if habit_name is not None:
                 completion_date =self.get_valid_completion_date(habit_name)
-                self.analytics.add_new_tracking_record(habit_name, completion_date)
-                #self.habit_db.insert_tracking_record(habit_name, completion_date)
-                print("Tracking record added successfully!")
+                if self.analytics.add_new_tracking_record(habit_name, completion_date):
+                    # Only cache the date once the record is actually stored
+                    if habit_name in self._completion_dates_cache:
+                        self._completion_dates_cache[habit_name].add(completion_date)
+                    print("Tracking record added successfully!")
+                else:
+                    print(f"The tracking record for '{habit_name}' on {completion_date} could not be added.")
         except Exception as e:
             print(f"An error occurred while add tracking record : {e}")
         self.final_menu()
@@ -445,10 +521,10 @@ class UserInterface:
         habits=self.analytics.get_habits_info()
         if habits:
             # Transform data to match the desired format
-            formatted_habits = [(habit, description, periodicity, date.split()[0] , time) for _, habit, description, periodicity, date,time in habits]
+            formatted_habits = [(habit, description, periodicity, date.partition(" ")[0] , time) for _, habit, description, periodicity, date,time in habits]
 
             # Print table with headers
-            print(tabulate(formatted_habits, headers=['Habit Name', 'Description', 'Periodicity', 'Creation Date','Creation Time'], tablefmt='grid'))
+            print(format_grid(formatted_habits, ['Habit Name', 'Description', 'Periodicity', 'Creation Date','Creation Time']))
 
         else:
             print("No habits found.")
@@ -463,9 +539,9 @@ class UserInterface:
         tracking_records=self.analytics.list_all_tracking_records()
         if tracking_records:
             # Transform data to match the desired format
-            formatted_tracking_records = [(habit, date.split()[0]) for _, habit, date in tracking_records]
+            formatted_tracking_records = [(habit, date.partition(" ")[0]) for _, habit, date in tracking_records]
             # Print table
-            print(tabulate(formatted_tracking_records, headers=['Habit', 'Completion Date'], tablefmt='grid'))
+            print(format_grid(formatted_tracking_records, ['Habit', 'Completion Date']))
         else:
             print("No tracking records found.")
         self.final_menu()
@@ -479,9 +555,9 @@ class UserInterface:
         habits = self.analytics.list_habits_by_periodicity(periodicity)
         if habits:
             # Transform data to match the desired format
-            formatted_habits = [(habit, description, periodicity, date.split()[0] ,creation_time ) for _, habit, description, periodicity, date ,creation_time  in habits]
+            formatted_habits = [(habit, description, periodicity, date.partition(" ")[0] ,creation_time ) for _, habit, description, periodicity, date ,creation_time  in habits]
             # Print table with headers
-            print(tabulate(formatted_habits, headers=['Habit Name', 'Description', 'Periodicity', 'Creation Date' , 'Creation Time '], tablefmt='grid'))
+            print(format_grid(formatted_habits, ['Habit Name', 'Description', 'Periodicity', 'Creation Date' , 'Creation Time ']))
 
         else:
             print("No habits found with the given periodicity.")
@@ -499,10 +575,10 @@ class UserInterface:
                 tracking_records=self.analytics.list_tracking_records_of_habit(habit_name)
                 if tracking_records:
                     # Transform data to match the desired format: (Habit, Completion Date)
-                    formatted_tracking_records = [(habit, date.split()[0]) for _, habit, date in tracking_records]
+                    formatted_tracking_records = [(habit, date.partition(" ")[0]) for _, habit, date in tracking_records]
 
                     # Display the tracking records in a tabular format
-                    print(tabulate(formatted_tracking_records, headers=['Habit', 'Completion Date'], tablefmt='grid'))
+                    print(format_grid(formatted_tracking_records, ['Habit', 'Completion Date']))
 
                 else:
                     print(f"No tracking records for {habit_name} found.")
@@ -523,7 +599,7 @@ class UserInterface:
                 formatted_habits = [(habit, count) for habit, count in list_struggling_habits_last_month]
                 # Display the struggling habits in a tabular format
                 print("The struggling habits in the last month:")
-                print(tabulate(formatted_habits, headers=['Habit Name', 'Completion Times'], tablefmt='grid'))
+                print(format_grid(formatted_habits, ['Habit Name', 'Completion Times']))
                 # Highlight the top struggled habit
                 habit_name, times = list_struggling_habits_last_month[0]
                 print(f"Your top struggled habit last month: {habit_name} {times} times")
@@ -582,7 +658,7 @@ class UserInterface:
                 formatted_habits = [(habit, longest_streak) for habit, longest_streak in list_longest_run_streak_of_all_habits]
                 # Display all longest streaks in a tabular format
                 print("The longest run streak of all habits:")
-                print(tabulate(formatted_habits, headers=['Habit Name', 'Longest Run Streak'], tablefmt='grid'))
+                print(format_grid(formatted_habits, ['Habit Name', 'Longest Run Streak']))
                 
                 # Identify habits with the maximum streak
                 max_streak = list_longest_run_streak_of_all_habits[0][1]
@@ -1,7 +1,15 @@
 import sqlite3
-from datetime import datetime, timedelta
+from contextlib import contextmanager
 import os
 
+# Path of the `src` package directory, which holds the database file
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Restricts completion_date to the previous calendar month (local time), computed by SQLite
+LAST_MONTH_CONDITION = """
+    completion_date >= date('now', 'localtime', 'start of month', '-1 month')
+    AND completion_date < date('now', 'localtime', 'start of month')
+"""
+
 class HabitTrackerDB:
     def __init__(self, connection=None, db_name='habit_tracker.db'):
         """
@@ -10,15 +18,24 @@ class HabitTrackerDB:
         Args:
             connection (sqlite3.Connection, optional): A pre-existing connection to the database. 
                 If not provided, a new connection is created.
-            db_name (str, optional): The SQLite database file name. Defaults to 'habit_tracker.db'.
+            db_name (str, optional): The SQLite database file name, or ':memory:' for an
+                in-memory database. Defaults to 'habit_tracker.db'.
 
         Behavior:
             If no `connection` is provided, a new SQLite connection is created.
+            The file path is only resolved in that case (`db_path` is None otherwise).
             The `_initialize_db()` method is called to set up tables if they don't already exist.
         """
         self.db_name = db_name
-        self.db_path = self._get_db_path(db_name)
+        if connection is not None:
+            self.db_path = None # The caller's connection is used, no file to locate
+        elif db_name == ":memory:":
+            self.db_path = db_name
+        else:
+            self.db_path = self._get_db_path(db_name)
         self.connection = connection if connection else sqlite3.connect(self.db_path)
+        self._in_transaction = False # True while a transaction() block is open
+        self._transaction_error = None # First sqlite3.Error of a nested block in the open transaction
         self._initialize_db()
 
     def _get_db_path(self, db_name):
@@ -31,20 +48,61 @@ class HabitTrackerDB:
         Returns:
             str: The full path to the SQLite database file.
         """
-        # Get the path to the `src` package directory
-        package_dir = os.path.dirname(os.path.abspath(__file__))
         # Set the database path to be inside the `src` package
-        return os.path.join(package_dir, db_name)
+        return os.path.join(PACKAGE_DIR, db_name)
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the enclosed statements in a single transaction.
+
+        The transaction is committed when the block exits normally and rolled back if it
+        raises. Nested blocks join the outermost transaction instead of committing on
+        their own, so several database methods can be grouped into one commit.
+
+        The database methods catch and print their own `sqlite3.Error`s. A nested block
+        therefore remembers the first error raised inside it, and the outermost block
+        re-raises that error when it exits, so one failed statement rolls back the whole
+        transaction instead of committing the statements that did succeed.
+
+        Yields:
+            sqlite3.Connection: The database connection.
+
+        Raises:
+            sqlite3.Error: If a statement of a nested block failed.
+        """
+        if self._in_transaction:
+            # Already inside a transaction; the outer block commits
+            try:
+                yield self.connection
+            except sqlite3.Error as e:
+                if self._transaction_error is None:
+                    self._transaction_error = e # Re-raised by the outer block to roll back
+                raise
+            return
+        self._in_transaction = True
+        self._transaction_error = None
+        try:
+            with self.connection:
+                yield self.connection
+                if self._transaction_error is not None:
+                    raise self._transaction_error
+        finally:
+            self._in_transaction = False
+            self._transaction_error = None
     def close(self):
         """
         Closes the connection to the database.
 
         Behavior:
             Ensures the database connection is safely closed. If any error occurs, 
-            it logs the exception.
+            it logs the exception. A WAL journal is checkpointed into the database file
+            and truncated first, so the file is self-contained once the tracker exits.
         """
         try:
             if self.connection:
+                if self._is_file_backed():
+                    # Does nothing unless the database is in WAL mode
+                    self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
                 self.connection.close()
                 self.connection = None
         except sqlite3.Error as e:
@@ -54,17 +112,22 @@ class HabitTrackerDB:
         Initializes the database schema.
 
         Behavior:
-            Creates the necessary tables (`habit` and `habit_completions`) 
+            Configures the connection (see `_configure_connection()`), then creates the
+            necessary tables (`habit` and `habit_completions`) and their indexes
             if they do not already exist.
         """
+        self._configure_connection()
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
 
+                # The integer primary keys are plain rowid aliases: nothing reads them, and
+                # AUTOINCREMENT would update sqlite_sequence on every insert
+
                 # Create the 'habit' table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS habit (
-                        habit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        habit_id INTEGER PRIMARY KEY,
                         name TEXT UNIQUE NOT NULL,
                         description TEXT NOT NULL,
                         periodicity TEXT NOT NULL,
@@ -76,15 +139,59 @@ class HabitTrackerDB:
                 # Create the 'habit_completions' table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS habit_completions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        id INTEGER PRIMARY KEY,
                         habit_name TEXT NOT NULL,
                         completion_date TEXT NOT NULL,
-                        FOREIGN KEY(habit_name) REFERENCES habit(name),
+                        FOREIGN KEY(habit_name) REFERENCES habit(name) ON DELETE CASCADE ON UPDATE CASCADE,
                         UNIQUE (habit_name, completion_date)      
                     )
                 """)
+
+                # UNIQUE (habit_name, completion_date) already indexes lookups by habit name.
+                # Date-range queries over all habits (last month) need the date first; including
+                # habit_name makes the index covering for them.
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_habit_completions_date
+                    ON habit_completions (completion_date, habit_name)
+                """)
+                # Used by get_habits_by_periodicity
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_habit_periodicity ON habit (periodicity)")
         except sqlite3.Error as e:
             print(f"Error initializing database: {e}")
+    def _configure_connection(self):
+        """
+        Sets the connection PRAGMAs used by the tracker.
+
+        Behavior:
+            For a file-backed database the journal is switched to WAL with
+            `synchronous=NORMAL`, so a commit needs a single fsync and readers do not wait
+            for writers. If WAL cannot be enabled (e.g. on a network share), the default
+            journal mode is kept. Foreign keys are enforced, and a busy timeout and a
+            larger page cache are set on every connection.
+        """
+        try:
+            cursor = self.connection.cursor()
+            if self._is_file_backed():
+                # journal_mode returns the mode actually in effect
+                journal_mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                if journal_mode.lower() == "wal":
+                    cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON") # Not stored in the file, so set for every connection
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.execute("PRAGMA cache_size=-10000") # About 10 MB
+        except sqlite3.Error as e:
+            print(f"Error configuring database connection: {e}")
+    def _is_file_backed(self):
+        """
+        Checks whether the connection's main database is stored in a file.
+
+        Returns:
+            bool: False for in-memory databases (such as those used in the tests), True otherwise.
+        """
+        for _, name, file in self.connection.execute("PRAGMA database_list"):
+            if name == "main":
+                return bool(file)
+        return False
     def _execute_query(self, query, parameters=None):
         """
         Executes a SQL query with optional parameters.
@@ -97,7 +204,7 @@ class HabitTrackerDB:
             list: Query results, if any, or an empty list if no results.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 if parameters:
                     cursor.execute(query, parameters)
@@ -113,6 +220,10 @@ class HabitTrackerDB:
         Args:
             habit (object): An instance of the habit containing the necessary details.
 
+        Returns:
+            bool: True if the habit was inserted, False if a database error occurred
+                  (e.g., a duplicate name).
+
         Query:
             INSERT INTO habit (name, description, periodicity, creation_date, creation_time)
             VALUES (?, ?, ?, ?, ?)
@@ -124,25 +235,33 @@ class HabitTrackerDB:
         # Ensure creation_date and creation_time are strings
         creation_date = str(habit.creation_date)
         creation_time = str(habit.creation_time)
-        self._execute_query(query, (habit.name, habit.description, habit.periodicity, creation_date,creation_time))
-    def insert_tracking_record(self, habit_name, completion_date):
+        # _execute_query returns None when the statement failed
+        return self._execute_query(query, (habit.name, habit.description, habit.periodicity, creation_date,creation_time)) is not None
+    def insert_habits(self, habits):
         """
-        Inserts a new tracking record into the database.
+        Inserts several habits in a single transaction.
 
         Args:
-            habit_name (str): The name of the habit.
-            completion_date (str): The date the habit was completed (format: YYYY-MM-DD).
+            habits (iterable): Instances of the habit containing the necessary details.
+
+        Behavior:
+            The statement is prepared once and executed for every habit. If any habit
+            fails (e.g., a duplicate name), none of the habits are inserted.
 
         Query:
-            INSERT INTO habit_completions (habit_name, completion_date)
-            VALUES (?, ?)
+            INSERT INTO habit (name, description, periodicity, creation_date, creation_time)
         """
-        
         query = """
-            INSERT INTO habit_completions (habit_name, completion_date)
-            VALUES (?, ?)
+            INSERT INTO habit (name, description, periodicity, creation_date,creation_time)
+            VALUES (?, ?, ?, ?, ?)
         """
-        self._execute_query(query, (habit_name, completion_date))
+        try:
+            with self.transaction():
+                self.connection.executemany(
+                    query, ((habit.name, habit.description, habit.periodicity, str(habit.creation_date), str(habit.creation_time))
+                            for habit in habits))
+        except sqlite3.Error as e:
+            print(f"Error inserting habits: {e}")
     def habit_exists(self, habit_name):
         """
         Checks if a habit exists in the database.
@@ -154,12 +273,12 @@ class HabitTrackerDB:
             bool: True if the habit exists, False otherwise.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM habit WHERE name = ?", (habit_name,))
-                count = cursor.fetchone()[0]
-                return count > 0  # Return True if count > 0, else False 
-            
+                # Stop at the first matching row instead of counting them
+                cursor.execute("SELECT 1 FROM habit WHERE name = ? LIMIT 1", (habit_name,))
+                return cursor.fetchone() is not None
+
         except sqlite3.Error as e:
             print(f"Error checking if habit exists: {e}")
             return False
@@ -175,7 +294,7 @@ class HabitTrackerDB:
                            otherwise None.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT description, periodicity FROM habit WHERE name = ?", (habit_name,))
                 result = cursor.fetchone()
@@ -197,7 +316,7 @@ class HabitTrackerDB:
             list: A list of tuples containing all habit records.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT * FROM habit")
                 return cursor.fetchall()
@@ -212,11 +331,11 @@ class HabitTrackerDB:
             list: A list of habit names (strings).
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT name FROM habit")
-                habits = cursor.fetchall()  # Fetch all habit names
-                return [habit[0] for habit in habits]  # Extract habit names from tuples
+                # Iterate the cursor directly instead of building an intermediate fetchall() list
+                return [name for (name,) in cursor]
         except sqlite3.Error as e:
             print(f"Error retrieving all habits: {e}")
             return []
@@ -231,7 +350,7 @@ class HabitTrackerDB:
             UPDATE habit SET description = ?, periodicity = ? WHERE name = ?
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("""
                     UPDATE habit
@@ -254,7 +373,7 @@ class HabitTrackerDB:
             Prints an error message if a database error occurs.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("DELETE FROM habit WHERE name = ?", (habit_name,))
         except sqlite3.Error as e:
@@ -267,6 +386,10 @@ class HabitTrackerDB:
             habit_name (str): The name of the habit.
             completion_date (str): The date of the completion (format: YYYY-MM-DD).
 
+        Returns:
+            bool: True if the record was inserted, False if a database error occurred
+                  (e.g., a duplicate completion date).
+
         Query:
             INSERT INTO habit_completions (habit_name, completion_date)
         """
@@ -275,7 +398,37 @@ class HabitTrackerDB:
             VALUES (?, ?)
         """
         completion_date = str(completion_date)
-        self._execute_query(query, (habit_name, completion_date))
+        # _execute_query returns None when the statement failed
+        return self._execute_query(query, (habit_name, completion_date)) is not None
+    def insert_tracking_records(self, tracking_records, ignore_duplicates=False):
+        """
+        Inserts several tracking records in a single transaction.
+
+        Args:
+            tracking_records (iterable): Pairs of (habit_name, completion_date),
+                with completion_date in YYYY-MM-DD format.
+            ignore_duplicates (bool, optional): Skip records whose completion date is already
+                saved for the habit instead of failing. Defaults to False.
+
+        Behavior:
+            The statement is prepared once and executed for every pair. Unless duplicates
+            are ignored, if any record fails (e.g., a duplicate completion date), none of
+            the records are inserted.
+
+        Query:
+            INSERT [OR IGNORE] INTO habit_completions (habit_name, completion_date)
+        """
+        # OR IGNORE lets callers pass records that may already exist without checking them first
+        query = f"""
+            INSERT {"OR IGNORE " if ignore_duplicates else ""}INTO habit_completions (habit_name, completion_date)
+            VALUES (?, ?)
+        """
+        try:
+            with self.transaction():
+                self.connection.executemany(
+                    query, ((habit_name, str(completion_date)) for habit_name, completion_date in tracking_records))
+        except sqlite3.Error as e:
+            print(f"Error inserting tracking records: {e}")
     def get_all_tracking_records(self):
         """
         Retrieves all tracking records from the database.
@@ -284,13 +437,33 @@ class HabitTrackerDB:
             list: A list of all tracking records as tuples (habit_name, completion_date).
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT * FROM habit_completions")
                 return cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Error retrieving all tracking records: {e}")
             return []
+    def iter_all_tracking_records(self, batch_size=1000):
+        """
+        Iterates over all tracking records without loading them into memory at once.
+
+        Args:
+            batch_size (int, optional): The number of rows fetched from the cursor at a time. Defaults to 1000.
+
+        Yields:
+            tuple: One tracking record (id, habit_name, completion_date) at a time.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT * FROM habit_completions")
+            while True:
+                records = cursor.fetchmany(batch_size)
+                if not records:
+                    break
+                yield from records
+        except sqlite3.Error as e:
+            print(f"Error iterating over all tracking records: {e}")
     def get_creation_date_of_habit(self,habit_name):
         """
         Fetches the creation date of a habit.
@@ -302,7 +475,7 @@ class HabitTrackerDB:
             str or None: The creation date as a string if the habit is found; otherwise, None.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT creation_date FROM habit WHERE name = ?", (habit_name,))
                 result = cursor.fetchone()
@@ -337,30 +510,200 @@ class HabitTrackerDB:
         except sqlite3.Error as e:
             print(f"Error retrieving habit periodicity: {e}")
             return None
-    def get_completion_dates_of_habit(self, habit_name):
+    def get_completion_ordinals_of_habit(self, habit_name, descending=False):
         """
-        Fetches the completion dates of a habit by its name.
+        Fetches the completion dates of a habit as integer day ordinals, sorted by date.
+
+        The ordinals match `datetime.date.toordinal()` (0001-01-01 is day 1), so consecutive
+        days differ by exactly 1 and the dates do not need to be parsed in Python.
 
         Args:
             habit_name (str): The name of the habit.
+            descending (bool, optional): Return the most recent date first. Defaults to False.
 
         Returns:
-            list or None: A list of completion dates (strings) if found; otherwise, None.
+            list or None: A list of day ordinals (ints) if found; otherwise, None.
         """
+        order = "DESC" if descending else "ASC"
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
-                cursor.execute("SELECT completion_date FROM habit_completions WHERE habit_name = ?", (habit_name,))
-                result = cursor.fetchall()
+                cursor.execute(f"""
+                    SELECT CAST(julianday(completion_date) - 1721424.5 AS INTEGER)
+                    FROM habit_completions
+                    WHERE habit_name = ?
+                    ORDER BY completion_date {order}
+                """, (habit_name,))
+                result = [ordinal for (ordinal,) in cursor]
+                if result:
+                    return result
+                return None
+        except sqlite3.Error as e:
+            print(f"Error retrieving completion ordinals for habit '{habit_name}': {e}")
+            return None
+    def get_all_habit_periodicities(self):
+        """
+        Fetches the periodicity of every habit in a single query.
 
-                if result:  # Check if there are any completion dates
-                    return [row[0] for row in result]  # Return list of completion dates as strings
-                else:
-                    return None  # Return None if no completion dates are found
+        Returns:
+            dict: A mapping of habit name to periodicity (e.g., {'dancing': 'daily'}),
+                  in insertion order. Returns an empty dict if no habits exist.
+        """
+        try:
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute("SELECT name, periodicity FROM habit")
+                return dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            print(f"Error retrieving habit periodicities: {e}")
+            return {}
+    def get_all_completion_dates(self):
+        """
+        Fetches the completion dates of every habit in a single query.
+
+        Returns:
+            dict: A mapping of habit name to its list of completion dates (strings),
+                  sorted in ascending order. Habits without completions are not included.
+        """
+        try:
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute("""
+                    SELECT habit_name, completion_date
+                    FROM habit_completions
+                    ORDER BY habit_name, completion_date
+                """)
+                completion_dates = {}
+                for habit_name, completion_date in cursor:
+                    completion_dates.setdefault(habit_name, []).append(completion_date)
+                return completion_dates
+        except sqlite3.Error as e:
+            print(f"Error retrieving all completion dates: {e}")
+            return {}
+    def iter_completion_dates_of_habit(self, habit_name, descending=False):
+        """
+        Iterates over the completion dates of a habit, sorted by date, as rows arrive from SQLite.
 
+        Args:
+            habit_name (str): The name of the habit.
+            descending (bool, optional): Yield the most recent date first. Defaults to False.
+
+        Yields:
+            str: One completion date (YYYY-MM-DD) at a time.
+
+        The sorting is served by the index behind UNIQUE (habit_name, completion_date).
+        """
+        order = "DESC" if descending else "ASC"
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"SELECT completion_date FROM habit_completions WHERE habit_name = ? ORDER BY completion_date {order}",
+                (habit_name,))
+            for (completion_date,) in cursor:
+                yield completion_date
         except sqlite3.Error as e:
             print(f"Error retrieving completion dates for habit '{habit_name}': {e}")
-            return None  # Return None in case of a database error
+    def get_completion_dates_of_habit(self, habit_name, descending=False):
+        """
+        Fetches the completion dates of a habit by its name, sorted by date.
+
+        Args:
+            habit_name (str): The name of the habit.
+            descending (bool, optional): Return the most recent date first. Defaults to False.
+
+        Returns:
+            list or None: A list of completion dates (strings) if found; otherwise, None.
+        """
+        result = list(self.iter_completion_dates_of_habit(habit_name, descending))
+        if result:  # Check if there are any completion dates
+            return result  # Return list of completion dates as strings
+        return None  # Return None if no completion dates are found or a database error occurred
+    def get_longest_daily_streak(self, habit_name):
+        """
+        Calculates the longest run of consecutive completion days of a habit inside SQLite.
+
+        Consecutive dates share the same value of `julianday(completion_date) - ROW_NUMBER()`,
+        so grouping by that value yields one group per streak.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            int: The longest daily streak, or 0 if the habit has no completion dates.
+        """
+        try:
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute("""
+                    WITH streak_groups AS (
+                        SELECT julianday(completion_date) - ROW_NUMBER() OVER (ORDER BY completion_date) AS grp
+                        FROM habit_completions
+                        WHERE habit_name = ?
+                    )
+                    SELECT COALESCE(MAX(streak_length), 0)
+                    FROM (SELECT COUNT(*) AS streak_length FROM streak_groups GROUP BY grp)
+                """, (habit_name,))
+                return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error calculating longest daily streak for habit '{habit_name}': {e}")
+            return 0
+    def get_longest_daily_streaks(self):
+        """
+        Calculates the longest daily streak of every habit with completions in a single query.
+
+        Uses the same grouping as `get_longest_daily_streak`, with the row numbers counted
+        separately for each habit.
+
+        Returns:
+            dict: A mapping of habit name to its longest daily streak. Habits without
+                  completions are not included.
+        """
+        try:
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute("""
+                    WITH streak_groups AS (
+                        SELECT habit_name,
+                               julianday(completion_date)
+                                   - ROW_NUMBER() OVER (PARTITION BY habit_name ORDER BY completion_date) AS grp
+                        FROM habit_completions
+                    )
+                    SELECT habit_name, MAX(streak_length)
+                    FROM (SELECT habit_name, COUNT(*) AS streak_length FROM streak_groups GROUP BY habit_name, grp)
+                    GROUP BY habit_name
+                """)
+                return dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            print(f"Error calculating longest daily streaks: {e}")
+            return {}
+    def get_current_daily_streak(self, habit_name):
+        """
+        Calculates the run of consecutive completion days ending at the most recent completion of a habit.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            int: The current daily streak, or 0 if the habit has no completion dates.
+        """
+        try:
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute("""
+                    WITH streak_groups AS (
+                        SELECT completion_date,
+                               julianday(completion_date) - ROW_NUMBER() OVER (ORDER BY completion_date) AS grp
+                        FROM habit_completions
+                        WHERE habit_name = ?
+                    )
+                    SELECT COUNT(*)
+                    FROM streak_groups
+                    WHERE grp = (SELECT grp FROM streak_groups ORDER BY completion_date DESC LIMIT 1)
+                """, (habit_name,))
+                return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error calculating current daily streak for habit '{habit_name}': {e}")
+            return 0
     def get_tracking_records_of_habit(self,habit_name):
         """
         Fetches all tracking records of a habit.
@@ -372,7 +715,7 @@ class HabitTrackerDB:
             list: A list of tuples containing tracking records.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT * FROM habit_completions WHERE habit_name = ?", (habit_name,))
                 records=cursor.fetchall() #ist of tuples
@@ -391,20 +734,18 @@ class HabitTrackerDB:
             habit_name (str): The name of the habit whose tracking records are to be deleted.
 
         Returns:
-            None if no records exist; otherwise, the records are deleted.
+            int: The number of deleted tracking records (0 if none existed or an error occurred).
         """
     
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
-                 # Check if there are tracking records for the habit
-                records = self.get_tracking_records_of_habit(habit_name)
-                if records:
-                    cursor.execute("DELETE FROM habit_completions WHERE habit_name = ?", (habit_name,))    
-                else:
-                    return None
+                # A single DELETE; its rowcount tells whether there were records, so no SELECT first
+                cursor.execute("DELETE FROM habit_completions WHERE habit_name = ?", (habit_name,))
+                return cursor.rowcount
         except sqlite3.Error as e:
             print(f"Error deleting habit tracking records: {e}")
+            return 0
     def get_habits_by_periodicity(self, periodicity):
         """
         Fetches all habits with a specific periodicity.
@@ -416,7 +757,7 @@ class HabitTrackerDB:
             list: A list of tuples representing habits with the given periodicity.
         """
         try:
-            with self.connection:
+            with self.transaction():
                 cursor = self.connection.cursor()
                 cursor.execute("SELECT * FROM habit WHERE periodicity = ?", (periodicity,))
                 return cursor.fetchall()  # Example: [(1, 'dancing', 'party', 'daily', '2024-01-01'), ...]
@@ -432,23 +773,12 @@ class HabitTrackerDB:
                   or None if no completions are found.
         """
         try:
-            # Get the current date
-            today = datetime.today().date()
-
-            # Get the first day of the current month
-            first_day_of_current_month = today.replace(day=1)
-
-            # Get the last day of the previous month
-            last_day_of_last_month = first_day_of_current_month - timedelta(days=1)
-
-            # Get the first day of the previous month
-            first_day_of_last_month = last_day_of_last_month.replace(day=1)
-            # Fetch completions within the date range
-            completions= self._execute_query("""
+            # Fetch completions within the previous month; the date range is computed in SQL
+            completions= self._execute_query(f"""
                 SELECT habit_name, completion_date 
                 FROM habit_completions 
-                WHERE completion_date BETWEEN ? AND ?
-            """, (first_day_of_last_month.isoformat(), last_day_of_last_month.isoformat()))
+                WHERE {LAST_MONTH_CONDITION}
+            """)
             if not completions:
                 #No habit completions found for the last month.
                 return None
@@ -459,3 +789,26 @@ class HabitTrackerDB:
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             return []
+    def count_habit_completions_last_month(self):
+        """
+        Counts the completions of each habit in the previous calendar month.
+
+        Returns:
+            list: A list of tuples (habit_name, count) for habits completed in the last month,
+                  or None if no completions are found.
+        """
+        try:
+            # Count completions per habit within the previous month
+            completion_counts = self._execute_query(f"""
+                SELECT habit_name, COUNT(*)
+                FROM habit_completions
+                WHERE {LAST_MONTH_CONDITION}
+                GROUP BY habit_name
+            """)
+            if not completion_counts:
+                #No habit completions found for the last month.
+                return None
+            return completion_counts
+        except sqlite3.Error as e:
+            print(f"Error counting habit completions: {e}")
+            return None
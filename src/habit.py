@@ -4,8 +4,25 @@ from .database import HabitTrackerDB
 Represents a habit with associated metadata and database operations.
 """
 
+_default_db = None
+
+def get_default_db():
+    """
+    Return the shared HabitTrackerDB used by habits created without a database.
+
+    The instance is created on the first call rather than when this module is imported,
+    and reused afterwards so such habits share one connection.
+
+    Returns:
+        HabitTrackerDB: The shared database instance.
+    """
+    global _default_db
+    if _default_db is None:
+        _default_db = HabitTrackerDB()
+    return _default_db
+
 class Habit:
-    def __init__(self, name, description, periodicity, creation_date=None, creation_time=None, database=HabitTrackerDB()):
+    def __init__(self, name, description, periodicity, creation_date=None, creation_time=None, database=None):
         """
         Initialize a new habit.
 
@@ -15,14 +32,14 @@ class Habit:
             periodicity (str): The periodicity of the habit (e.g., 'daily', 'weekly').
             creation_date (str, optional): The date the habit was created. Defaults to None.
             creation_time (str, optional): The time the habit was created. Defaults to None.
-            database (HabitTrackerDB, optional): An instance of the HabitTrackerDB to interact with the database. Defaults to an instance of HabitTrackerDB.
+            database (HabitTrackerDB, optional): An instance of the HabitTrackerDB to interact with the database. Defaults to None, in which case the shared instance from get_default_db() is used.
         """
         self.name = name
         self.description = description
         self.periodicity = periodicity
         self.creation_date = creation_date if creation_date is not None else 'Unknown'  # Default to 'Unknown' if not provided
         self.creation_time = creation_time if creation_time is not None else 'Unknown'  # Default to 'Unknown' if not provided
-        self.db = database
+        self.db = database if database is not None else get_default_db()
     def __str__(self):
         """
         Return a string representation of the habit.
@@ -41,11 +58,15 @@ class Habit:
 
         This method uses the insert_habit function from the HabitTrackerDB
         to save the current habit object to the database.
+
+        Returns:
+            bool: True if the habit was saved, False otherwise.
         """
         try:
-            self.db.insert_habit(self)
+            return self.db.insert_habit(self)
         except Exception as e:
             print(f"Failed to add habit '{self.name}': {e}")
+            return False
     def modify_habit(self):
         """
         Modify the habit details in the database.
@@ -4,11 +4,15 @@ conftest.py
 This module provides shared pytest fixtures for the HabitTrackerDB application.
 It includes:
 - An in-memory SQLite database fixture for testing the HabitTrackerDB class.
+- Fixtures providing HabitAnalyzer instances, with and without a database.
+- A session-scoped fixture grouping the mock completion dates by habit.
 - A fixture for preloading the database with mock data to simulate real-world scenarios.
+- Parametrization of tests taking a `mock_habit` argument over the predefined mock habits.
 """
 import pytest
 import sqlite3
 from src.database import HabitTrackerDB
+from src.analytics import HabitAnalyzer
 class MockHabit:
     """
     Represents a mock habit object for testing purposes.
@@ -29,6 +33,99 @@ class MockHabit:
         self.periodicity = periodicity
         self.creation_date = creation_date
         self.creation_time = creation_time
+# Mock habits loaded by `predefined_data`
+MOCK_HABITS = [
+    MockHabit("exercise", "Weekly exercise habit", "weekly", "2024-11-01", "08:00"),
+    MockHabit("meditation", "Daily meditation habit", "daily", "2024-10-30", "22:00"),
+    MockHabit("reading", "Weekly reading habit", "weekly", "2024-10-28", "09:00"),
+    MockHabit("coding", "Daily coding practice", "daily", "2024-11-02", "10:00"),
+    MockHabit("water intake", "Track daily water intake", "daily", "2024-11-10", "11:00"),
+]
+# Mock tracking data (habit name, completion date) loaded by `predefined_data`
+MOCK_TRACKING_DATA = [
+    # Exercise tracking records
+    ("exercise", "2024-11-01"),  # Week 44
+    ("exercise", "2024-11-03"),  # Week 44
+    ("exercise", "2024-11-05"),  # Week 45
+    ("exercise", "2024-11-06"),  # Week 45
+    ("exercise", "2024-11-22"),  # Week 47
+    ("exercise", "2024-11-27"),  # Week 48
+    ("exercise", "2024-11-29"),  # Week 48
+    ("exercise", "2024-12-02"),  # Week 49
+    ("exercise", "2024-12-03"),  # Week 49
+    # Meditation tracking records
+    ("meditation", "2024-11-01"), 
+    ("meditation", "2024-11-02"), 
+    ("meditation", "2024-11-03"), 
+    ("meditation", "2024-11-04"),
+    ("meditation", "2024-11-09"), 
+    ("meditation", "2024-11-23"), 
+    ("meditation", "2024-11-24"), 
+    ("meditation", "2024-11-13"),
+    ("meditation", "2024-11-14"), 
+    ("meditation", "2024-11-15"), 
+    ("meditation", "2024-11-27"), 
+    ("meditation", "2024-11-28"),
+    ("meditation", "2024-11-29"), 
+    ("meditation", "2024-11-30"),
+    ("meditation", "2024-12-01"),
+    ("meditation", "2024-12-02"),
+    ("meditation", "2024-12-04"),
+    ("meditation", "2024-12-06"),
+    ("meditation", "2024-12-07"),    
+    ("meditation", "2024-12-09"),
+    ("meditation", "2024-12-10"),
+    ("meditation", "2024-12-11"),
+    # reading tracking records
+    ("reading", "2024-11-05"),#week 45
+    ("reading", "2024-11-06"),#week 45
+    ("reading", "2024-11-10"),#week 45
+    ("reading", "2024-11-18"),#week 47
+    ("reading", "2024-11-25"),#week 48
+    ("reading", "2024-12-05"),#week 49
+    ("reading", "2024-12-15"),#week 50
+    ("reading", "2024-12-16"),#week 51
+    # coding tracking records
+    ("coding", "2024-11-03"),
+    ("coding", "2024-11-04"), 
+    ("coding", "2024-11-05"),
+    ("coding", "2024-11-06"),
+    ("coding", "2024-11-07"),
+    ("coding", "2024-11-08"), 
+    ("coding", "2024-11-09"),
+    ("coding", "2024-11-11"),    
+    ("coding", "2024-11-13"),
+    ("coding", "2024-11-16"), 
+    ("coding", "2024-11-17"),
+    ("coding", "2024-11-18"),
+    ("coding", "2024-11-23"),
+    ("coding", "2024-11-30"), 
+    ("coding", "2024-12-01"),
+    # water intake tracking records
+    ("water intake", "2024-11-11"),
+    ("water intake", "2024-11-13"),
+    ("water intake", "2024-11-19"),
+    ("water intake", "2024-11-20"),
+    ("water intake", "2024-11-21"),
+    ("water intake", "2024-11-22"),
+    ("water intake", "2024-11-25"),
+    ("water intake", "2024-11-26"),       
+    ("water intake", "2024-11-28"),
+    ("water intake", "2024-11-30"),
+    ("water intake", "2024-12-01"),
+    ("water intake", "2024-12-02"), 
+    ("water intake", "2024-12-03"),
+    ("water intake", "2024-12-04"),
+]
+def pytest_generate_tests(metafunc):
+    """
+    Parametrize tests that take a `mock_habit` argument with each of the predefined mock habits.
+
+    Every habit becomes its own test case (e.g. `test_check_habit_exists[exercise]`), so a
+    failure for one habit does not hide the results for the others.
+    """
+    if "mock_habit" in metafunc.fixturenames:
+        metafunc.parametrize("mock_habit", MOCK_HABITS, ids=[habit.name for habit in MOCK_HABITS])
 @pytest.fixture
 def habit_tracker_db():
     """
@@ -42,6 +139,45 @@ def habit_tracker_db():
     yield habit_tracker # Provide the database instance to the test
     habit_tracker.close() # Ensure the database connection is closed after the test
 @pytest.fixture
+def analyzer(habit_tracker_db):
+    """
+    Pytest fixture to provide a HabitAnalyzer bound to the in-memory database.
+
+    Function-scoped like `habit_tracker_db`, so the analyzer's caches never leak between tests.
+
+    Returns:
+        HabitAnalyzer: An analyzer using the `habit_tracker_db` instance of the test.
+    """
+    return HabitAnalyzer(habit_tracker_db)
+@pytest.fixture(scope="session")
+def pure_analyzer():
+    """
+    Pytest fixture to provide a HabitAnalyzer without a database, shared by the whole session.
+
+    Only for tests of methods that do not touch the database (sorting, date and streak calculations).
+
+    Returns:
+        HabitAnalyzer: An analyzer whose database is None.
+    """
+    return HabitAnalyzer(None)
+@pytest.fixture(scope="session")
+def tracking_by_habit():
+    """
+    Pytest fixture to provide the mock completion dates grouped by habit name, built once per session.
+
+    The dates are sorted in ascending order here, so tests can compare against them directly.
+    Shared by the whole session, so tests must not modify the lists.
+
+    Returns:
+        dict: A mapping of habit name to the ascending list of its mock completion dates.
+    """
+    grouped = {}
+    for habit_name, completion_date in MOCK_TRACKING_DATA:
+        grouped.setdefault(habit_name, []).append(completion_date)
+    for completion_dates in grouped.values():
+        completion_dates.sort()
+    return grouped
+@pytest.fixture
 def predefined_data(habit_tracker_db):
     """
     Pytest fixture to preload the HabitTrackerDB with predefined mock data.
@@ -53,94 +189,16 @@ def predefined_data(habit_tracker_db):
         tuple: A tuple containing:
             - list of MockHabit objects added to the database.
             - list of tracking data (habit name and completion date) added to the database.
+
+    Raises:
+        sqlite3.Error: If any mock row cannot be inserted; nothing is seeded in that case.
     """
-    # Define mock habits
-    mock_habits = [
-        MockHabit("exercise", "Weekly exercise habit", "weekly", "2024-11-01", "08:00"),
-        MockHabit("meditation", "Daily meditation habit", "daily", "2024-10-30", "22:00"),
-        MockHabit("reading", "Weekly reading habit", "weekly", "2024-10-28", "09:00"),
-        MockHabit("coding", "Daily coding practice", "daily", "2024-11-02", "10:00"),
-        MockHabit("water intake", "Track daily water intake", "daily", "2024-11-10", "11:00"),
-    ]
-    # Define mock tracking data
-    mock_tracking_data = [
-        # Exercise tracking records
-        ("exercise", "2024-11-01"),  # Week 44
-        ("exercise", "2024-11-03"),  # Week 44
-        ("exercise", "2024-11-05"),  # Week 45
-        ("exercise", "2024-11-06"),  # Week 45
-        ("exercise", "2024-11-22"),  # Week 47
-        ("exercise", "2024-11-27"),  # Week 48
-        ("exercise", "2024-11-29"),  # Week 48
-        ("exercise", "2024-12-02"),  # Week 49
-        ("exercise", "2024-12-03"),  # Week 49
-        # Meditation tracking records
-        ("meditation", "2024-11-01"), 
-        ("meditation", "2024-11-02"), 
-        ("meditation", "2024-11-03"), 
-        ("meditation", "2024-11-04"),
-        ("meditation", "2024-11-09"), 
-        ("meditation", "2024-11-23"), 
-        ("meditation", "2024-11-24"), 
-        ("meditation", "2024-11-13"),
-        ("meditation", "2024-11-14"), 
-        ("meditation", "2024-11-15"), 
-        ("meditation", "2024-11-27"), 
-        ("meditation", "2024-11-28"),
-        ("meditation", "2024-11-29"), 
-        ("meditation", "2024-11-30"),
-        ("meditation", "2024-12-01"),
-        ("meditation", "2024-12-02"),
-        ("meditation", "2024-12-04"),
-        ("meditation", "2024-12-06"),
-        ("meditation", "2024-12-07"),    
-        ("meditation", "2024-12-09"),
-        ("meditation", "2024-12-10"),
-        ("meditation", "2024-12-11"),
-        # reading tracking records
-        ("reading", "2024-11-05"),#week 45
-        ("reading", "2024-11-06"),#week 45
-        ("reading", "2024-11-10"),#week 45
-        ("reading", "2024-11-18"),#week 47
-        ("reading", "2024-11-25"),#week 48
-        ("reading", "2024-12-05"),#week 49
-        ("reading", "2024-12-15"),#week 50
-        ("reading", "2024-12-16"),#week 51
-        # coding tracking records
-        ("coding", "2024-11-03"),
-        ("coding", "2024-11-04"), 
-        ("coding", "2024-11-05"),
-        ("coding", "2024-11-06"),
-        ("coding", "2024-11-07"),
-        ("coding", "2024-11-08"), 
-        ("coding", "2024-11-09"),
-        ("coding", "2024-11-11"),    
-        ("coding", "2024-11-13"),
-        ("coding", "2024-11-16"), 
-        ("coding", "2024-11-17"),
-        ("coding", "2024-11-18"),
-        ("coding", "2024-11-23"),
-        ("coding", "2024-11-30"), 
-        ("coding", "2024-12-01"),
-        # water intake tracking records
-        ("water intake", "2024-11-11"),
-        ("water intake", "2024-11-13"),
-        ("water intake", "2024-11-19"),
-        ("water intake", "2024-11-20"),
-        ("water intake", "2024-11-21"),
-        ("water intake", "2024-11-22"),
-        ("water intake", "2024-11-25"),
-        ("water intake", "2024-11-26"),       
-        ("water intake", "2024-11-28"),
-        ("water intake", "2024-11-30"),
-        ("water intake", "2024-12-01"),
-        ("water intake", "2024-12-02"), 
-        ("water intake", "2024-12-03"),
-        ("water intake", "2024-12-04"),
-    ]
-    # Insert habits and tracking data into the database
-    for habit in mock_habits:
-        habit_tracker_db.insert_habit(habit)
-    for habit_name, completion_date in mock_tracking_data:
-        habit_tracker_db.insert_tracking_record(habit_name, completion_date)
+    # Copy the mock habits and tracking data so tests can modify their lists
+    mock_habits = list(MOCK_HABITS)
+    mock_tracking_data = list(MOCK_TRACKING_DATA)
+    # Insert habits and tracking data into the database in a single transaction. A failing row
+    # raises here and rolls back the whole seed, instead of leaving a half-seeded database
+    with habit_tracker_db.transaction():
+        habit_tracker_db.insert_habits(mock_habits)
+        habit_tracker_db.insert_tracking_records(mock_tracking_data)
     return mock_habits, mock_tracking_data
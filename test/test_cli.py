@@ -1,8 +1,8 @@
-from unittest.mock import patch, Mock
+from types import SimpleNamespace
+from unittest.mock import patch, Mock, DEFAULT
 import pytest
 from src.cli import UserInterface
-from datetime import date,datetime
-from tabulate import tabulate
+from datetime import date
 # Mock class for Habit, used for testing UserInterface methods.
 class MockHabit:
     def __init__(self, name, description, periodicity, creation_date=None, creation_time=None):
@@ -11,66 +11,100 @@ class MockHabit:
         self.periodicity = periodicity
         self.creation_date = creation_date
         self.creation_time = creation_time
+# Stand-in for questionary.confirm whose prompts are always answered the same way.
+class ConfirmStub:
+    def __init__(self, answer=True):
+        self.answer = answer
+    def __call__(self, *args, **kwargs):
+        return self
+    def ask(self):
+        return self.answer
+# Stand-in for HabitAnalyzer offering only the given methods, each a Mock returning the given value.
+def stub_analytics(**return_values):
+    return SimpleNamespace(**{name: Mock(return_value=value) for name, value in return_values.items()})
 # Fixture to initialize the UserInterface with a mock database.
 @pytest.fixture
 def user_interface(habit_tracker_db):
     """Fixture to initialize the UserInterface with a mock database."""
     return UserInterface(db=habit_tracker_db)
+@pytest.fixture
+def questionary_text(monkeypatch):
+    """Fixture to replace questionary.text with a mock for the duration of a test."""
+    mock_text = Mock()
+    monkeypatch.setattr("questionary.text", mock_text)
+    return mock_text
+@pytest.fixture(scope="session")
+def _stub_cache():
+    """Session-wide Mocks for UserInterface methods that tests only need to silence."""
+    return {"final_menu": Mock(), "clear_screen": Mock()}
+@pytest.fixture
+def mock_final_menu(user_interface, monkeypatch, _stub_cache):
+    """Fixture to replace final_menu with the shared Mock, reset for each test."""
+    stub = _stub_cache["final_menu"]
+    stub.reset_mock()
+    monkeypatch.setattr(user_interface, "final_menu", stub)
+    return stub
+@pytest.fixture
+def mock_clear_screen(user_interface, monkeypatch, _stub_cache):
+    """Fixture to replace clear_screen with the shared Mock, reset for each test."""
+    stub = _stub_cache["clear_screen"]
+    stub.reset_mock()
+    monkeypatch.setattr(user_interface, "clear_screen", stub)
+    return stub
+# Menu options of the main menu and the UserInterface methods they call
+MENU_METHODS = {
+    "Create New Habit": "add_habit",
+    "Modify an Existing Habit": "modify_habit",
+    "Remove a Habit": "remove_habit",
+    "Add Tracking Record for a Habit": "add_tracking_record",
+    "Show All Habits": "show_all_habits",
+    "Show All Tracking Records": "show_all_tracking_records",
+    "Show List of Habits Based on Periodicity": "show_habits_by_periodicity",
+    "Show Tracking Records for a Habit": "show_tracking_records_of_habit",
+    "Show Struggling Habits from the Last Month": "show_struggling_habits_last_month",
+    "Show Current Streak for a Habit": "show_current_streak_for_habit",
+    "Show Longest Run Streak for a Habit": "show_longest_streak_for_given_habit",
+    "Show Longest Run Streak Among All Defined Habits": "show_longest_run_streak_of_all_habits",
+    "Exit": "exit_program"
+}
 # Test the display_menu method to ensure correct menu handling.
-def test_display_menu(user_interface):
-    """Test the display_menu method to ensure correct menu handling."""
-
-    # Define the mocked methods that correspond to menu options
-    mock_methods = {
-        "Create New Habit": "add_habit",
-        "Modify an Existing Habit": "modify_habit",
-        "Remove a Habit": "remove_habit",
-        "Add Tracking Record for a Habit": "add_tracking_record",
-        "Show All Habits": "show_all_habits",
-        "Show All Tracking Records": "show_all_tracking_records",
-        "Show List of Habits Based on Periodicity": "show_habits_by_periodicity",
-        "Show Tracking Records for a Habit": "show_tracking_records_of_habit",
-        "Show Struggling Habits from the Last Month": "show_struggling_habits_last_month",
-        "Show Current Streak for a Habit": "show_current_streak_for_habit",
-        "Show Longest Run Streak for a Habit": "show_longest_streak_for_given_habit",
-        "Show Longest Run Streak Among All Defined Habits": "show_longest_run_streak_of_all_habits",
-        "Exit": "exit_program"
-    }
-
-    # Patch the methods in UserInterface
-    with patch("questionary.select") as mock_select:
-        for menu_option, method_name in mock_methods.items():
-            # Mock the questionary.select response to return the current method
-            mock_method = patch.object(user_interface, method_name, return_value=None).start()
-            mock_select.return_value.ask.return_value = getattr(user_interface, method_name)
-
-            # Call the display_menu method
-            user_interface.display_menu()
-
-            # Assert the corresponding method was called
-            mock_method.assert_called_once()
-
-            # Stop patching the method
-            patch.stopall()
-
-            # Reset the mock for the next iteration
-            mock_select.reset_mock()
-def test_clear_screen_windows(user_interface):
+@pytest.mark.parametrize("menu_option, method_name", MENU_METHODS.items(), ids=MENU_METHODS.values())
+def test_display_menu(user_interface, menu_option, method_name):
+    """Test the display_menu method to ensure correct menu handling, one case per menu option."""
+    # The menu option offers the method it is named after
+    menu_choices = {choice["name"]: choice["value"] for choice in user_interface._main_menu_choices}
+    assert menu_choices[menu_option] == getattr(user_interface, method_name)
+
+    with patch("questionary.select") as mock_select, \
+         patch.object(user_interface, method_name, return_value=None) as mock_method:
+        # Mock the questionary.select response to return the current method
+        mock_select.return_value.ask.return_value = mock_method
+
+        # Call the display_menu method
+        user_interface.display_menu()
+
+        # Assert the corresponding method was called
+        mock_method.assert_called_once()
+def test_clear_screen_windows(user_interface, monkeypatch):
     """Test the clear_screen method for Windows OS."""
-    with patch("platform.system", return_value="Windows"), patch("os.system") as mock_os_system:
-        user_interface.clear_screen()
-        mock_os_system.assert_called_once_with('cls')
-def test_clear_screen_unix(user_interface):
+    os_system_calls = []
+    monkeypatch.setattr("platform.system", lambda: "Windows")
+    monkeypatch.setattr("os.system", os_system_calls.append)
+    user_interface.clear_screen()
+    assert os_system_calls == ['cls']
+def test_clear_screen_unix(user_interface, monkeypatch, capsys):
     """Test the clear_screen method for Unix-based OS."""
-    with patch("platform.system", return_value="Linux"), patch("os.system") as mock_os_system:
-        user_interface.clear_screen()
-        mock_os_system.assert_called_once_with('clear')
+    os_system_calls = []
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+    monkeypatch.setattr("os.system", os_system_calls.append)
+    user_interface.clear_screen()
+    assert capsys.readouterr().out == "\x1b[2J\x1b[H"
+    assert os_system_calls == []
 # Test get_limited_length_input with valid input.
-@patch("questionary.text")
-def test_get_limited_length_input_valid(mock_questionary_text, user_interface):
+def test_get_limited_length_input_valid(questionary_text, user_interface):
     """Test get_limited_length_input with valid input."""
     # Simulate a valid input that is within the max length
-    mock_questionary_text.return_value.ask.return_value = "ValidInput"
+    questionary_text.return_value.ask.return_value = "ValidInput"
 
     result = user_interface.get_limited_length_input(
         value="ValidInput",
@@ -79,141 +113,151 @@ def test_get_limited_length_input_valid(mock_questionary_text, user_interface):
     )
     # Assert the result matches the input value
     assert result == "ValidInput"
-    mock_questionary_text.return_value.ask.assert_not_called()
-def test_ensure_habit_exists(user_interface):
+    questionary_text.return_value.ask.assert_not_called()
+def test_get_limited_length_input_lowercase(user_interface):
+    """Test get_limited_length_input strips and lowercases the accepted input when asked to."""
+    result = user_interface.get_limited_length_input(value="  Morning Run ", prompt="Enter a value:", max_length=25, lowercase=True)
+    assert result == "morning run"
+def test_ensure_habit_exists(user_interface, monkeypatch):
     """Test the ensure_habit_exists method to ensure it correctly checks for habit existence."""
     
-    # Mock check_habit_exists method to simulate the existence of habits
-    with patch.object(user_interface.analytics, "check_habit_exists") as mock_check_habit_exists:
-        
-        # Case 1: Habit exists in the database
-        mock_check_habit_exists.return_value = True
-        habit_name = "exercise"
-        
-        exists = user_interface.ensure_habit_exists(habit_name)
-        
-        # Assert that ensure_habit_exists returns True when the habit exists
-        assert exists is True
-        mock_check_habit_exists.assert_called_once_with(habit_name)
-        
-        # Case 2: Habit does not exist in the database
-        mock_check_habit_exists.return_value = False
-        habit_name = "nonexistent_habit"
-        
-        exists = user_interface.ensure_habit_exists(habit_name)
-        
-        # Assert that ensure_habit_exists returns False when the habit does not exist
-        assert exists is False
-        mock_check_habit_exists.assert_called_with(habit_name)
-def test_ensure_lowercase_with_string(user_interface):
-    """Test ensure_lowercase with a string input."""
-    assert user_interface.ensure_lowercase("HELLO") == "hello"
-    assert user_interface.ensure_lowercase("TeSt") == "test"
-def test_ensure_lowercase_with_non_string(user_interface):
-    """Test ensure_lowercase with non-string inputs."""
-    assert user_interface.ensure_lowercase(123) == 123  # Integer input remains unchanged
-    assert user_interface.ensure_lowercase(45.67) == 45.67  # Float input remains unchanged
-def test_ensure_lowercase_with_special_characters(user_interface):
-    """Test ensure_lowercase with strings containing special characters."""
-    assert user_interface.ensure_lowercase("!@#$%^") == "!@#$%^"
-    assert user_interface.ensure_lowercase("Hello, World!") == "hello, world!"
-def test_get_valid_habit_name():
-    ui = UserInterface()
-
-    with patch("questionary.text") as mock_questionary_text, \
-         patch.object(UserInterface, "ensure_habit_exists") as mock_ensure_habit_exists, \
+    # Replace list_habit_names to simulate the habits stored in the database, recording each call
+    list_habit_names_calls = []
+    def list_habit_names():
+        list_habit_names_calls.append(None)
+        return ["exercise", "reading"]
+    monkeypatch.setattr(user_interface.analytics, "list_habit_names", list_habit_names)
+
+    # Case 1: Habit exists in the database
+    assert user_interface.ensure_habit_exists("exercise") is True
+
+    # Case 2: Habit does not exist in the database
+    assert user_interface.ensure_habit_exists("nonexistent_habit") is False
+
+    # The habit names are loaded from the database only once
+    assert len(list_habit_names_calls) == 1
+def test_get_habit_names_tracks_added_and_removed_habits(user_interface, predefined_data):
+    """Test that the cached habit names follow habits added and removed through the UI."""
+    assert user_interface.ensure_habit_exists("exercise") is True
+
+    with patch.object(user_interface, "get_valid_habit_name", return_value="walking"), \
+         patch.object(user_interface, "get_description", return_value="Daily walking habit"), \
+         patch.object(user_interface, "get_periodicity", return_value="daily"), \
+         patch.object(user_interface, "get_date", return_value="2025-01-13"), \
+         patch.object(user_interface, "get_valid_time", return_value="10:00"), \
+         patch.object(user_interface, "final_menu"):
+        user_interface.add_habit()
+    assert user_interface.ensure_habit_exists("walking") is True
+
+    # A failed insert does not add the name to the cache
+    user_interface.habit_db.connection.execute("""
+        CREATE TRIGGER block_habit_insert BEFORE INSERT ON habit
+        BEGIN SELECT RAISE(ABORT, 'habit insert blocked'); END
+    """)
+    with patch.object(user_interface, "get_valid_habit_name", return_value="cycling"), \
+         patch.object(user_interface, "get_description", return_value="Daily cycling habit"), \
+         patch.object(user_interface, "get_periodicity", return_value="daily"), \
+         patch.object(user_interface, "get_date", return_value="2025-01-13"), \
+         patch.object(user_interface, "get_valid_time", return_value="10:00"), \
+         patch.object(user_interface, "final_menu"):
+        user_interface.add_habit()
+    assert user_interface.ensure_habit_exists("cycling") is False
+
+    with patch.object(user_interface, "select_habit_name", return_value="exercise"), \
+         patch("questionary.confirm", new=ConfirmStub()), \
+         patch.object(user_interface, "final_menu"):
+        user_interface.remove_habit()
+    assert user_interface.ensure_habit_exists("exercise") is False
+def test_completion_dates_cache_skips_failed_tracking_record(user_interface, predefined_data, capsys):
+    """Test that a tracking record whose insert fails is not added to the cached completion dates."""
+    habit_name = "meditation"
+    completion_date = date(2025, 2, 1)
+    # Load the cached completion dates of the habit before the insert
+    assert user_interface.is_date_in_completion_dates(habit_name, completion_date) is False
+
+    user_interface.habit_db.connection.execute("""
+        CREATE TRIGGER block_completion_insert BEFORE INSERT ON habit_completions
+        BEGIN SELECT RAISE(ABORT, 'tracking record insert blocked'); END
+    """)
+    with patch.multiple(user_interface,
+                        select_habit_name=Mock(return_value=habit_name),
+                        get_valid_completion_date=Mock(return_value=completion_date),
+                        final_menu=DEFAULT):
+        user_interface.add_tracking_record()
+    printed = capsys.readouterr().out # Output of the method under test
+
+    assert user_interface.is_date_in_completion_dates(habit_name, completion_date) is False
+    assert "Tracking record added successfully!" not in printed
+    assert f"The tracking record for '{habit_name}' on {completion_date} could not be added." in printed
+@pytest.mark.parametrize("value, expected", [
+    ("HELLO", "hello"),
+    ("TeSt", "test"),
+    (123, 123),  # Integer input remains unchanged
+    (45.67, 45.67),  # Float input remains unchanged
+    ("!@#$%^", "!@#$%^"),  # Special characters remain unchanged
+    ("Hello, World!", "hello, world!"),
+])
+def test_ensure_lowercase(user_interface, value, expected):
+    """Test ensure_lowercase with string, non-string and special character inputs."""
+    assert user_interface.ensure_lowercase(value) == expected
+def test_get_valid_habit_name(user_interface, questionary_text):
+    with patch.object(UserInterface, "ensure_habit_exists") as mock_ensure_habit_exists, \
          patch.object(UserInterface, "get_limited_length_input") as mock_get_limited_length_input:
 
         # Case 1: Habit does not exist
-        mock_questionary_text.return_value.ask.side_effect = ["exercise"]
+        questionary_text.return_value.ask.side_effect = ["exercise"]
         mock_get_limited_length_input.side_effect = ["exercise"]
         mock_ensure_habit_exists.side_effect = [False]
-        result = ui.get_valid_habit_name()
+        result = user_interface.get_valid_habit_name()
         assert result == "exercise"
 
         # Case 2: Habit already exists
-        mock_questionary_text.return_value.ask.side_effect = ["exercise", "meditation"]
+        questionary_text.return_value.ask.side_effect = ["exercise", "meditation"]
         mock_get_limited_length_input.side_effect = ["exercise", "meditation"]
         mock_ensure_habit_exists.side_effect = [True, False]
-        result = ui.get_valid_habit_name()
+        result = user_interface.get_valid_habit_name()
         assert result == "meditation"
 
         # Case 3: Input too long
-        mock_questionary_text.return_value.ask.side_effect = ["ThisIsAVeryLongHabitNameOverLimit", "exercise"]
+        questionary_text.return_value.ask.side_effect = ["ThisIsAVeryLongHabitNameOverLimit", "exercise"]
         mock_get_limited_length_input.side_effect = ["exercise"]
         mock_ensure_habit_exists.side_effect = [False]
-        result = ui.get_valid_habit_name()
+        result = user_interface.get_valid_habit_name()
         assert result == "exercise"
-def test_get_description(user_interface):
+def test_get_description(user_interface, questionary_text):
     """Test the get_description method to ensure proper input handling."""
-    
-    # Case 1: User provides a valid description within the limit
-    with patch("questionary.text") as mock_text:
-        mock_text.return_value.ask.return_value = "This is a valid description"
-        
+    # User provides a valid description within the limit
+    questionary_text.return_value.ask.return_value = "This is a valid description"
+
+    description = user_interface.get_description()
+
+    # Assert that the returned description matches the mock input
+    assert description == "This is a valid description"
+    questionary_text.assert_called_once_with("Enter the description of the habit  shorter than 100 characters:")
+@pytest.mark.parametrize("user_input", ["A" * 200, ""], ids=["too_long", "empty"])
+def test_get_description_asks_again(user_interface, questionary_text, user_input):
+    """Test that get_description asks again when the description is longer than the max length or empty."""
+    questionary_text.return_value.ask.return_value = user_input
+
+    # Mock the prompt asking for the description again
+    with patch.object(user_interface, "get_limited_length_input", return_value="Short valid description") as mock_get_limited_length_input:
         description = user_interface.get_description()
-        
-        # Assert that the returned description matches the mock input
-        assert description == "This is a valid description"
-        mock_text.assert_called_once_with("Enter the description of the habit  shorter than 100 characters:")
-
-    # Case 2: User provides a description longer than the max length
-    with patch("questionary.text") as mock_text:
-        # Simulate the user entering a long description
-        mock_text.return_value.ask.return_value = "A" * 200  # 200 characters
-        
-        # Mock the prompt asking for the description again
-        with patch.object(user_interface, "get_limited_length_input") as mock_get_limited_length_input:
-            mock_get_limited_length_input.return_value = "Short valid description"
-            
-            description = user_interface.get_description()
-            
-            # Assert that the returned description matches the corrected input
-            assert description == "Short valid description"
-            mock_text.assert_called_with("Enter the description of the habit  shorter than 100 characters:")
-            mock_get_limited_length_input.assert_called_once()
-
-    # Case 3: User provides an empty description
-    with patch("questionary.text") as mock_text:
-        # Simulate empty user input
-        mock_text.return_value.ask.return_value = ""
-        
-        # Mock the prompt asking for the description again
-        with patch.object(user_interface, "get_limited_length_input") as mock_get_limited_length_input:
-            mock_get_limited_length_input.return_value = "Short valid description"
-            
-            description = user_interface.get_description()
-            
-            # Assert that the returned description matches the corrected input
-            assert description == "Short valid description"
-            mock_text.assert_called_with("Enter the description of the habit  shorter than 100 characters:")
-            mock_get_limited_length_input.assert_called_once()
-def test_get_periodicity(user_interface):
+
+        # Assert that the returned description matches the corrected input
+        assert description == "Short valid description"
+        questionary_text.assert_called_once_with("Enter the description of the habit  shorter than 100 characters:")
+        mock_get_limited_length_input.assert_called_once()
+@pytest.mark.parametrize("choice", ["daily", "weekly"])
+def test_get_periodicity(user_interface, choice):
     """Test the get_periodicity method to ensure it handles periodicity selection correctly."""
-    
-    # Mock questionary.select to simulate user input
-    
-    # Case 1: User selects 'Daily' as periodicity
+    # Mock questionary.select to simulate the user selecting the periodicity
     with patch("questionary.select") as mock_select:
-        mock_select.return_value.ask.return_value = "daily"  # Simulate 'Daily' choice
-        
-        periodicity = user_interface.get_periodicity()
-        
-        # Assert that the returned periodicity is 'daily'
-        assert periodicity == "daily"
-        mock_select.assert_called_once_with("Please Choose a periodicity: ", choices=[
-            {"name": "Daily", "value": "daily"},
-            {"name": "Weekly", "value": "weekly"}
-        ])
-    
-    # Case 2: User selects 'Weekly' as periodicity
-    with patch("questionary.select") as mock_select:
-        mock_select.return_value.ask.return_value = "weekly"  # Simulate 'Weekly' choice
-        
+        mock_select.return_value.ask.return_value = choice
+
         periodicity = user_interface.get_periodicity()
-        
-        # Assert that the returned periodicity is 'weekly'
-        assert periodicity == "weekly"
+
+        # Assert that the returned periodicity is the selected one, offered from both choices
+        assert periodicity == choice
         mock_select.assert_called_once_with("Please Choose a periodicity: ", choices=[
             {"name": "Daily", "value": "daily"},
             {"name": "Weekly", "value": "weekly"}
@@ -223,29 +267,20 @@ def test_get_today_date(user_interface):
     
     result = user_interface.get_today_date()
     assert result == date.today().strftime('%Y-%m-%d')
-def test_get_valid_date(user_interface):
+@pytest.mark.parametrize("inputs, expected", [
+    (["2025-01-14"], "2025-01-14"),  # User enters a valid date
+    (["invalid-date", "2025-01-14"], "2025-01-14"),  # An invalid date format once, then a valid date
+    (["invalid-date", "another-invalid-date", "2025-01-14"], "2025-01-14"),  # An invalid date format repeatedly
+    (["20250114", "2025-W03-2", "2025-01-14"], "2025-01-14"),  # Other ISO 8601 forms are rejected
+], ids=["valid", "invalid_once", "invalid_repeatedly", "non_canonical_iso"])
+def test_get_valid_date(user_interface, inputs, expected):
     """Test the get_valid_date method to ensure it correctly handles date input validation."""
-    
-    # Case 1: User enters a valid date
-    with patch("builtins.input", return_value="2025-01-14"):  # Mock valid user input
+    with patch("builtins.input", side_effect=inputs) as mock_input:
         valid_date = user_interface.get_valid_date()
-        
-        # Assert that the returned date is correct
-        assert valid_date == "2025-01-14"
 
-    # Case 2: User enters an invalid date format once, then a valid date
-    with patch("builtins.input", side_effect=["invalid-date", "2025-01-14"]):  # Mock invalid input, then valid input
-        valid_date = user_interface.get_valid_date()
-        
-        # Assert that the returned date is correct
-        assert valid_date == "2025-01-14"
-    
-    # Case 3: User enters an invalid date format repeatedly
-    with patch("builtins.input", side_effect=["invalid-date", "another-invalid-date", "2025-01-14"]):
-        valid_date = user_interface.get_valid_date()
-        
-        # Assert that the returned date is correct
-        assert valid_date == "2025-01-14"
+        # Assert that the returned date is correct and the user was asked until it was valid
+        assert valid_date == expected
+        assert mock_input.call_count == len(inputs)
 def test_get_date(user_interface):
     """Test the get_date method to ensure it correctly handles 'Today' and 'Custom Date' choices."""
     
@@ -272,36 +307,20 @@ def test_get_date(user_interface):
         # Assert that the returned date is '2025-01-15' (mocked custom date)
         assert date_selected == "2025-01-15"
         mock_get_valid_date.assert_called_once()
-def test_get_valid_time(user_interface):
+@pytest.mark.parametrize("inputs, expected", [
+    (["14:30"], "14:30"),  # User enters a valid time
+    (["invalid-time", "14:30"], "14:30"),  # An invalid time once, then a valid time
+    (["invalid-time", "another-invalid-time", "14:30"], "14:30"),  # An invalid time format repeatedly
+    (["23:59"], "23:59"),  # A time in 24-hour format at the upper limit
+], ids=["valid", "invalid_once", "invalid_repeatedly", "upper_limit"])
+def test_get_valid_time(user_interface, inputs, expected):
     """Test the get_valid_time method to ensure it handles time validation properly."""
-    
-    # Case 1: User enters a valid time
-    with patch("builtins.input", return_value="14:30"):  # Mock valid user input
+    with patch("builtins.input", side_effect=inputs) as mock_input:
         valid_time = user_interface.get_valid_time()
-        
-        # Assert that the returned time is correct and formatted as HH:MM
-        assert valid_time == "14:30"
-    
-    # Case 2: User enters an invalid time once, then a valid time
-    with patch("builtins.input", side_effect=["invalid-time", "14:30"]):  # Mock invalid input, then valid input
-        valid_time = user_interface.get_valid_time()
-        
-        # Assert that the returned time is correct and formatted as HH:MM
-        assert valid_time == "14:30"
-    
-    # Case 3: User enters an invalid time format repeatedly
-    with patch("builtins.input", side_effect=["invalid-time", "another-invalid-time", "14:30"]):
-        valid_time = user_interface.get_valid_time()
-        
-        # Assert that the returned time is correct and formatted as HH:MM
-        assert valid_time == "14:30"
 
-    # Case 4: User enters a time in 24-hour format (e.g., 23:59)
-    with patch("builtins.input", return_value="23:59"):  # Mock valid time input at the upper limit
-        valid_time = user_interface.get_valid_time()
-        
-        # Assert that the returned time is correct and formatted as HH:MM
-        assert valid_time == "23:59"
+        # Assert that the returned time is correct, formatted as HH:MM, and the user was asked until it was valid
+        assert valid_time == expected
+        assert mock_input.call_count == len(inputs)
 def test_check_dates(user_interface):
     """Test the check_dates function to ensure correct date validation and error handling."""
 
@@ -314,7 +333,7 @@ def test_check_dates(user_interface):
         result = user_interface.check_dates(creation_date, completion_date)
         
         # Assert that the returned date is the same as the valid completion date
-        assert result == datetime.strptime(completion_date, "%Y-%m-%d").date()
+        assert result == date(2024, 11, 15)
 
     # Case 2: Invalid completion date (before creation date)
     with patch.object(user_interface, "get_date", return_value="2024-11-20"):  # First invalid, then valid date
@@ -325,7 +344,7 @@ def test_check_dates(user_interface):
         result = user_interface.check_dates(creation_date, completion_date)
         
         # Assert that the returned date is valid
-        assert result == datetime.strptime("2024-11-20", "%Y-%m-%d").date()
+        assert result == date(2024, 11, 20)
 
     # Case 3: Error in date format (invalid input)
     with patch.object(user_interface, "get_date", return_value="invalid-date-input"):
@@ -337,48 +356,50 @@ def test_check_dates(user_interface):
         
         # Assert that None is returned due to invalid date input
         assert result is None
-def test_is_date_in_completion_dates(user_interface, predefined_data):
+
+    # Case 4: A valid ISO 8601 date that is not in YYYY-MM-DD format
+    assert user_interface.check_dates("2024-11-10", "20241115") is None
+def test_is_date_in_completion_dates(user_interface, monkeypatch):
     """Test the is_date_in_completion_dates function to ensure correct date checking."""
-    
+    # Replace list_completion_dates_of_habit with a lookup of the simulated completion dates
+    completion_dates_by_habit = {
+        "meditation": ["2024-11-01", "2024-11-02", "2024-11-03", "2024-11-04"],
+        "coding": ["2024-11-01", "2024-11-03", "2024-11-04"],
+    }
+    monkeypatch.setattr(user_interface.analytics, "list_completion_dates_of_habit", completion_dates_by_habit.get)
+    completion_date = date(2024, 11, 2)
+
     # Case 1: Completion date exists in the habit's completion dates
-    with patch.object(user_interface.analytics, "list_completion_dates_of_habit", return_value=[
-        "2024-11-01", "2024-11-02", "2024-11-03", "2024-11-04"]):
-        habit_name = "meditation"
-        completion_date = datetime.strptime("2024-11-02", "%Y-%m-%d").date()  # Valid date in the list
-        
-        # Call is_date_in_completion_dates
-        result = user_interface.is_date_in_completion_dates(habit_name, completion_date)
-        
-        # Assert that the result is True, since the completion date is in the list
-        assert result is True
+    assert user_interface.is_date_in_completion_dates("meditation", completion_date) is True
 
     # Case 2: Completion date does not exist in the habit's completion dates
-    with patch.object(user_interface.analytics, "list_completion_dates_of_habit", return_value=[
-        "2024-11-01", "2024-11-03", "2024-11-04"]):
-        habit_name = "meditation"
-        completion_date = datetime.strptime("2024-11-02", "%Y-%m-%d").date()  # Invalid date not in the list
-        
-        # Call is_date_in_completion_dates
-        result = user_interface.is_date_in_completion_dates(habit_name, completion_date)
-        
-        # Assert that the result is False, since the completion date is not in the list
-        assert result is False
+    assert user_interface.is_date_in_completion_dates("coding", completion_date) is False
 
     # Case 3: The habit has no completion dates (i.e., the list is None)
-    with patch.object(user_interface.analytics, "list_completion_dates_of_habit", return_value=None):
-        habit_name = "nonexistent_habit"
-        completion_date = datetime.strptime("2024-11-02", "%Y-%m-%d").date()  # Any valid date
-        
-        # Call is_date_in_completion_dates
-        result = user_interface.is_date_in_completion_dates(habit_name, completion_date)
-        
-        # Assert that the result is False, since no completion dates exist
-        assert result is False
+    assert user_interface.is_date_in_completion_dates("nonexistent_habit", completion_date) is False
+def test_is_date_in_completion_dates_cache(user_interface, predefined_data):
+    """Test that completion dates are fetched once per habit and updated by add_tracking_record."""
+    habit_name = "meditation"
+    new_date = date(2024, 12, 12)
+
+    with patch.object(user_interface.analytics, "list_completion_dates_of_habit",
+                      wraps=user_interface.analytics.list_completion_dates_of_habit) as mock_list_completion_dates:
+        assert user_interface.is_date_in_completion_dates(habit_name, new_date) is False
+
+        # Adding a tracking record updates the cached dates
+        with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
+             patch.object(user_interface, "get_valid_completion_date", return_value=new_date), \
+             patch.object(user_interface, "final_menu"):
+            user_interface.add_tracking_record()
+        assert user_interface.is_date_in_completion_dates(habit_name, new_date) is True
+
+        # The database was queried only once
+        mock_list_completion_dates.assert_called_once_with(habit_name)
 def test_get_valid_completion_date(user_interface, predefined_data):
     """Test that the get_valid_completion_date function returns a valid date that is not already saved."""
     
     habit_name = "meditation"
-    valid_date = datetime.strptime("2024-12-12", "%Y-%m-%d").date()
+    valid_date = date(2024, 12, 12)
     
     # Mock the relevant methods
     with patch.object(user_interface, "check_dates", return_value=valid_date), \
@@ -391,6 +412,19 @@ def test_get_valid_completion_date(user_interface, predefined_data):
         # Assert that the valid date is returned and the duplicate check is not triggered
         assert completion_date == valid_date
         mock_is_date_in_completion_dates.assert_called_once_with(habit_name, valid_date)
+def test_get_valid_completion_date_retries_duplicate(user_interface):
+    """Test that get_valid_completion_date prompts again for an already saved date and fetches the creation date once."""
+    habit_name = "meditation"
+    new_date = date(2024, 12, 12)
+
+    with patch.object(user_interface.analytics, "get_creation_date_of_habit", return_value="2024-01-01") as mock_get_creation_date, \
+         patch.object(user_interface, "get_date", side_effect=["2024-12-01", "2024-12-12"]), \
+         patch.object(user_interface, "is_date_in_completion_dates", side_effect=[True, False]):
+
+        completion_date = user_interface.get_valid_completion_date(habit_name)
+
+        assert completion_date == new_date
+        mock_get_creation_date.assert_called_once_with(habit_name)
 def test_select_habit_name_no_habits(user_interface):
     # Mock the behavior of list_habit_names to return an empty list (no habits)
     with patch.object(user_interface.analytics, 'list_habit_names', return_value=[]):
@@ -432,12 +466,14 @@ def test_final_menu(user_interface):
 def test_add_habit(user_interface):
     """Test the add_habit method to ensure correct habit creation and navigation."""
     # Mock user inputs for the habit details
-    with patch.object(user_interface, "get_valid_habit_name", return_value="Test Habit"), \
-         patch.object(user_interface, "get_description", return_value="This is a test habit"), \
-         patch.object(user_interface, "get_periodicity", return_value="daily"), \
-         patch.object(user_interface, "get_date", return_value="2025-01-13"), \
-         patch.object(user_interface, "get_valid_time", return_value="10:00"), \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
+    with patch.multiple(user_interface,
+                        get_valid_habit_name=Mock(return_value="Test Habit"),
+                        get_description=Mock(return_value="This is a test habit"),
+                        get_periodicity=Mock(return_value="daily"),
+                        get_date=Mock(return_value="2025-01-13"),
+                        get_valid_time=Mock(return_value="10:00"),
+                        final_menu=DEFAULT) as patched_methods:
+        mock_final_menu = patched_methods["final_menu"]
 
         # Call the add_habit method
         user_interface.add_habit()
@@ -453,7 +489,7 @@ def test_remove_habit(user_interface):
     habit_name = "exercise"
     # Mock user inputs for removing the habit
     with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
-         patch("questionary.confirm", return_value=Mock(return_value=True)), \
+         patch("questionary.confirm", new=ConfirmStub()), \
          patch.object(user_interface, "final_menu") as mock_final_menu:
 
         # Call the remove_habit method
@@ -468,60 +504,77 @@ def test_remove_habit(user_interface):
 
         # Verify the final_menu method is called
         mock_final_menu.assert_called_once()
+def test_remove_habit_keeps_records_when_delete_fails(user_interface, predefined_data, capsys):
+    """Test that remove_habit keeps the tracking records when deleting the habit itself fails."""
+    habit_name = "meditation"
+    # Make the DELETE of the habit fail inside SQLite, after its tracking records were deleted
+    user_interface.habit_db.connection.execute("""
+        CREATE TRIGGER block_habit_delete BEFORE DELETE ON habit
+        BEGIN SELECT RAISE(ABORT, 'habit delete blocked'); END
+    """)
+    with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
+         patch("questionary.confirm", new=ConfirmStub()), \
+         patch.object(user_interface, "final_menu"):
+        user_interface.remove_habit()
+    printed = capsys.readouterr().out # Output of the method under test
+
+    # The failed DELETE rolls back the deletion of the tracking records as well
+    assert user_interface.habit_db.habit_exists(habit_name), "The habit should still exist."
+    assert user_interface.habit_db.get_tracking_records_of_habit(habit_name), "The tracking records should be restored by the rollback."
+    assert "An error occurred while removing the habit: habit delete blocked" in printed
+    assert "Habit removed successfully!" not in printed
 def test_modify_habit(user_interface):
     """Test the modify_habit method to ensure habits are updated correctly."""
     habit_name = "meditation"
 
-    # Mock user inputs and method behaviors
-    with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
-         patch("questionary.confirm", return_value=Mock(return_value=True)), \
-         patch.object(user_interface, "get_description", return_value="Updated meditation habit"), \
-         patch.object(user_interface, "get_periodicity", return_value="weekly"), \
-         patch.object(user_interface.analytics, "get_habit_description_and_periodicity", return_value=("Daily meditation habit", "daily")), \
-         patch.object(user_interface.analytics, "get_habit_periodicity_str", return_value="daily"), \
-         patch.object(user_interface.analytics, "check_tracking_records_of_habit_exists", return_value=[("2024-11-01",), ("2024-11-02",)]), \
-         patch.object(user_interface.analytics, "remove_tracking_records_of_habit") as mock_remove_tracking_records, \
-         patch.object(user_interface, "final_menu") as mock_final_menu, \
+    # Mock user inputs and method behaviors, one patch per patched object
+    mock_remove_tracking_records = Mock(return_value=2)
+    with patch.multiple(user_interface,
+                        select_habit_name=Mock(return_value=habit_name),
+                        get_description=Mock(return_value="Updated meditation habit"),
+                        get_periodicity=Mock(return_value="weekly"),
+                        final_menu=DEFAULT) as patched_methods, \
+         patch.multiple(user_interface.analytics,
+                        get_habit_description_and_periodicity=Mock(return_value=("Daily meditation habit", "daily")),
+                        get_habit_periodicity_str=Mock(return_value="daily"),
+                        remove_tracking_records_of_habit=mock_remove_tracking_records), \
+         patch("questionary.confirm", new=ConfirmStub()), \
          patch("src.cli.Habit.modify_habit") as mock_modify_habit:
+        mock_final_menu = patched_methods["final_menu"]
 
         # Call the modify_habit method
         user_interface.modify_habit()
 
         # Verify that the habit modification was called with updated details
         mock_modify_habit.assert_called_once_with()
-        print("modify_habit was called with updated details.")
 
         # Verify that tracking records were removed due to periodicity change
         mock_remove_tracking_records.assert_called_once_with(habit_name)
 
         # Verify final_menu is called after the modification
         mock_final_menu.assert_called_once()
-
-        print("Test passed: Habit modification successful.")
 def test_add_tracking_record(user_interface):
     """Test the add_tracking_record method to ensure tracking records are added correctly."""
     habit_name = "meditation"
     completion_date = "2025-01-13"
 
     # Mock user inputs and method behaviors
-    with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
-         patch.object(user_interface, "get_valid_completion_date", return_value=completion_date), \
-         patch.object(user_interface.analytics, "add_new_tracking_record") as mock_add_new_tracking_record, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
+    with patch.multiple(user_interface,
+                        select_habit_name=Mock(return_value=habit_name),
+                        get_valid_completion_date=Mock(return_value=completion_date),
+                        final_menu=DEFAULT) as patched_methods, \
+         patch.object(user_interface.analytics, "add_new_tracking_record") as mock_add_new_tracking_record:
+        mock_final_menu = patched_methods["final_menu"]
 
         # Call the add_tracking_record method
         user_interface.add_tracking_record()
 
         # Verify that the tracking record was added
         mock_add_new_tracking_record.assert_called_once_with(habit_name, completion_date)
-        print("add_new_tracking_record was called with correct arguments.")
 
         # Verify final_menu is called after adding the record
         mock_final_menu.assert_called_once()
-        print("final_menu was called.")
-
-        print("Test passed: Tracking record added successfully.")
-def test_show_all_tracking_records(user_interface):
+def test_show_all_tracking_records(user_interface, monkeypatch, capsys, mock_final_menu):
     """Test the show_all_tracking_records method to ensure tracking records are displayed correctly."""
     # Mock tracking records
     tracking_records = [
@@ -529,34 +582,33 @@ def test_show_all_tracking_records(user_interface):
         (2, "exercise", "2025-01-14"),
     ]
 
-    # Expected formatted tracking records
-    formatted_tracking_records = [
-        ("meditation", "2025-01-13"),
-        ("exercise", "2025-01-14"),
-    ]
-
-    # Mock the analytics method and the final_menu call
-    with patch.object(user_interface.analytics, "list_all_tracking_records", return_value=tracking_records), \
-         patch("builtins.print") as mock_print, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
+    # Expected table printed for the tracking records
+    expected_table = (
+        "+------------+-------------------+\n"
+        "| Habit      | Completion Date   |\n"
+        "+============+===================+\n"
+        "| meditation | 2025-01-13        |\n"
+        "+------------+-------------------+\n"
+        "| exercise   | 2025-01-14        |\n"
+        "+------------+-------------------+"
+    )
 
-        # Call the show_all_tracking_records method
-        user_interface.show_all_tracking_records()
+    # Mock the analytics method
+    monkeypatch.setattr(user_interface, "analytics", stub_analytics(list_all_tracking_records=tracking_records))
 
-        # Verify list_all_tracking_records is called
-        user_interface.analytics.list_all_tracking_records.assert_called_once()
-        print("list_all_tracking_records was called.")
+    # Call the show_all_tracking_records method
+    user_interface.show_all_tracking_records()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Verify the print output includes the formatted tracking records
-        formatted_table = tabulate(formatted_tracking_records, headers=['Habit', 'Completion Date'], tablefmt='grid')
-        mock_print.assert_any_call(formatted_table)
+    # Verify list_all_tracking_records is called
+    user_interface.analytics.list_all_tracking_records.assert_called_once()
 
-        # Verify final_menu is called after showing records
-        mock_final_menu.assert_called_once()
-        print("final_menu was called.")
+    # Verify the print output includes the formatted tracking records
+    assert expected_table in printed
 
-        print("Test passed: All tracking records were displayed correctly.")
-def test_show_habits_by_periodicity(user_interface):
+    # Verify final_menu is called after showing records
+    mock_final_menu.assert_called_once()
+def test_show_habits_by_periodicity(user_interface, monkeypatch, capsys, mock_final_menu):
     """Test the show_habits_by_periodicity method to ensure habits are filtered and displayed correctly."""
     # Mock input periodicity and corresponding habits data
     periodicity = "daily"
@@ -565,43 +617,37 @@ def test_show_habits_by_periodicity(user_interface):
         (2, "exercise", "Daily exercise habit", "daily", "2024-11-01 07:00:00", "07:00"),
     ]
 
-    # Expected formatted habits for tabulate
-    formatted_habits = [
-        ("meditation", "Daily meditation habit", "daily", "2024-10-30", "22:00"),
-        ("exercise", "Daily exercise habit", "daily", "2024-11-01", "07:00"),
-    ]
+    # Expected table printed for the habits
+    expected_table = (
+        "+--------------+------------------------+---------------+-----------------+------------------+\n"
+        "| Habit Name   | Description            | Periodicity   | Creation Date   | Creation Time    |\n"
+        "+==============+========================+===============+=================+==================+\n"
+        "| meditation   | Daily meditation habit | daily         | 2024-10-30      | 22:00            |\n"
+        "+--------------+------------------------+---------------+-----------------+------------------+\n"
+        "| exercise     | Daily exercise habit   | daily         | 2024-11-01      | 07:00            |\n"
+        "+--------------+------------------------+---------------+-----------------+------------------+"
+    )
 
     # Mock the required methods and dependencies
-    with patch.object(user_interface, "get_periodicity", return_value=periodicity), \
-         patch.object(user_interface.analytics, "list_habits_by_periodicity", return_value=habits), \
-         patch("builtins.print") as mock_print, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
+    monkeypatch.setattr(user_interface, "get_periodicity", Mock(return_value=periodicity))
+    monkeypatch.setattr(user_interface, "analytics", stub_analytics(list_habits_by_periodicity=habits))
 
-        # Call the show_habits_by_periodicity method
-        user_interface.show_habits_by_periodicity()
+    # Call the show_habits_by_periodicity method
+    user_interface.show_habits_by_periodicity()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Verify that get_periodicity is called
-        user_interface.get_periodicity.assert_called_once()
-        print("get_periodicity was called.")
+    # Verify that get_periodicity is called
+    user_interface.get_periodicity.assert_called_once()
 
-        # Verify list_habits_by_periodicity is called with the correct periodicity
-        user_interface.analytics.list_habits_by_periodicity.assert_called_once_with(periodicity)
-        print("list_habits_by_periodicity was called with periodicity:", periodicity)
+    # Verify list_habits_by_periodicity is called with the correct periodicity
+    user_interface.analytics.list_habits_by_periodicity.assert_called_once_with(periodicity)
 
-        # Verify the printed table includes the formatted habits
-        formatted_table = tabulate(
-            formatted_habits,
-            headers=['Habit Name', 'Description', 'Periodicity', 'Creation Date', 'Creation Time '],
-            tablefmt='grid',
-        )
-        mock_print.assert_any_call(formatted_table)
+    # Verify the printed table includes the formatted habits
+    assert expected_table in printed
 
-        # Verify final_menu is called
-        mock_final_menu.assert_called_once()
-        print("final_menu was called.")
-
-        print("Test passed: Habits by periodicity were displayed correctly.")
-def test_show_tracking_records_of_habit(user_interface):
+    # Verify final_menu is called
+    mock_final_menu.assert_called_once()
+def test_show_tracking_records_of_habit(user_interface, monkeypatch, capsys, mock_final_menu):
     """Test the show_tracking_records_of_habit method to ensure tracking records are displayed correctly."""
     # Mock input habit name and corresponding tracking records
     habit_name = "meditation"
@@ -610,43 +656,37 @@ def test_show_tracking_records_of_habit(user_interface):
         (2, "meditation", "2025-01-14 10:00:00"),
     ]
 
-    # Expected formatted tracking records for tabulate
-    formatted_tracking_records = [
-        ("meditation", "2025-01-13"),
-        ("meditation", "2025-01-14"),
-    ]
+    # Expected table printed for the tracking records
+    expected_table = (
+        "+------------+-------------------+\n"
+        "| Habit      | Completion Date   |\n"
+        "+============+===================+\n"
+        "| meditation | 2025-01-13        |\n"
+        "+------------+-------------------+\n"
+        "| meditation | 2025-01-14        |\n"
+        "+------------+-------------------+"
+    )
 
     # Mock the required methods and dependencies
-    with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
-         patch.object(user_interface.analytics, "list_tracking_records_of_habit", return_value=tracking_records), \
-         patch("builtins.print") as mock_print, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
-
-        # Call the show_tracking_records_of_habit method
-        user_interface.show_tracking_records_of_habit()
+    monkeypatch.setattr(user_interface, "select_habit_name", Mock(return_value=habit_name))
+    monkeypatch.setattr(user_interface, "analytics", stub_analytics(list_tracking_records_of_habit=tracking_records))
 
-        # Verify that select_habit_name is called
-        user_interface.select_habit_name.assert_called_once()
-        print("select_habit_name was called.")
+    # Call the show_tracking_records_of_habit method
+    user_interface.show_tracking_records_of_habit()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Verify list_tracking_records_of_habit is called with the correct habit name
-        user_interface.analytics.list_tracking_records_of_habit.assert_called_once_with(habit_name)
-        print("list_tracking_records_of_habit was called with habit name:", habit_name)
+    # Verify that select_habit_name is called
+    user_interface.select_habit_name.assert_called_once()
 
-        # Verify the printed table includes the formatted tracking records
-        formatted_table = tabulate(
-            formatted_tracking_records,
-            headers=['Habit', 'Completion Date'],
-            tablefmt='grid',
-        )
-        mock_print.assert_any_call(formatted_table)
+    # Verify list_tracking_records_of_habit is called with the correct habit name
+    user_interface.analytics.list_tracking_records_of_habit.assert_called_once_with(habit_name)
 
-        # Verify final_menu is called
-        mock_final_menu.assert_called_once()
-        print("final_menu was called.")
+    # Verify the printed table includes the formatted tracking records
+    assert expected_table in printed
 
-        print("Test passed: Tracking records of habit were displayed correctly.")
-def test_show_struggling_habits_last_month(user_interface):
+    # Verify final_menu is called
+    mock_final_menu.assert_called_once()
+def test_show_struggling_habits_last_month(user_interface, monkeypatch, capsys, mock_final_menu):
     """Test the show_struggling_habits_last_month method to ensure struggling habits are displayed correctly."""
     # Mock data for struggling habits
     struggling_habits = [
@@ -654,42 +694,38 @@ def test_show_struggling_habits_last_month(user_interface):
         ("exercise", 1),
     ]
 
-    # Expected formatted habits for tabulate
-    formatted_habits = [
-        ("meditation", 2),
-        ("exercise", 1),
-    ]
+    # Expected table printed for the struggling habits
+    expected_table = (
+        "+--------------+--------------------+\n"
+        "| Habit Name   |   Completion Times |\n"
+        "+==============+====================+\n"
+        "| meditation   |                  2 |\n"
+        "+--------------+--------------------+\n"
+        "| exercise     |                  1 |\n"
+        "+--------------+--------------------+"
+    )
 
     # Mock the required methods and dependencies
-    with patch.object(user_interface.analytics, "find_struggling_habits_last_month", return_value=struggling_habits), \
-         patch("builtins.print") as mock_print, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
-
-        # Call the show_struggling_habits_last_month method
-        user_interface.show_struggling_habits_last_month()
+    monkeypatch.setattr(user_interface, "analytics", stub_analytics(find_struggling_habits_last_month=struggling_habits))
 
-        # Verify that find_struggling_habits_last_month is called
-        user_interface.analytics.find_struggling_habits_last_month.assert_called_once()
-        print("find_struggling_habits_last_month was called.")
+    # Call the show_struggling_habits_last_month method
+    user_interface.show_struggling_habits_last_month()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Verify the print output includes the formatted struggling habits table
-        formatted_table = tabulate(
-            formatted_habits,
-            headers=['Habit Name', 'Completion Times'],
-            tablefmt='grid',
-        )
-        mock_print.assert_any_call("The struggling habits in the last month:")
-        mock_print.assert_any_call(formatted_table)
+    # Verify that find_struggling_habits_last_month is called
+    user_interface.analytics.find_struggling_habits_last_month.assert_called_once()
 
-        # Verify the top struggling habit is printed correctly
-        mock_print.assert_any_call("Your top struggled habit last month: meditation 2 times")
-
-        # Verify final_menu is called
-        mock_final_menu.assert_called_once()
-        print("final_menu was called.")
+    # Verify the heading, the struggling habits table and the top struggling habit are printed in order
+    expected_lines = [
+        "The struggling habits in the last month:",
+        expected_table,
+        "Your top struggled habit last month: meditation 2 times",
+    ]
+    assert printed == "\n".join(expected_lines) + "\n"
 
-        print("Test passed: Struggling habits for the last month were displayed correctly.")
-def test_show_current_streak_for_habit(user_interface):
+    # Verify final_menu is called
+    mock_final_menu.assert_called_once()
+def test_show_current_streak_for_habit(user_interface, monkeypatch, capsys, mock_final_menu):
     """Test the show_current_streak_for_habit method to ensure the correct streak is displayed."""
     # Mock habit name and tracking data
     habit_name = "meditation"
@@ -702,77 +738,65 @@ def test_show_current_streak_for_habit(user_interface):
     current_streak = 4  # Mocked current streak value
 
     # Mock the required methods and behaviors
-    with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
-         patch.object(user_interface.analytics, "list_tracking_records_of_habit", return_value=tracking_records), \
-         patch.object(user_interface.analytics, "get_current_streak_for_habit", return_value=current_streak), \
-         patch("builtins.print") as mock_print, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
-
-        # Call the show_current_streak_for_habit method
-        user_interface.show_current_streak_for_habit()
+    monkeypatch.setattr(user_interface, "select_habit_name", Mock(return_value=habit_name))
+    monkeypatch.setattr(user_interface, "analytics", stub_analytics(list_tracking_records_of_habit=tracking_records,
+                                                                    get_current_streak_for_habit=current_streak))
 
-        # Verify that list_tracking_records_of_habit is called
-        user_interface.analytics.list_tracking_records_of_habit.assert_called_once_with(habit_name)
-        print("list_tracking_records_of_habit was called.")
+    # Call the show_current_streak_for_habit method
+    user_interface.show_current_streak_for_habit()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Verify that get_current_streak_for_habit is called
-        user_interface.analytics.get_current_streak_for_habit.assert_called_once_with(habit_name)
-        print("get_current_streak_for_habit was called.")
+    # Verify that list_tracking_records_of_habit is called
+    user_interface.analytics.list_tracking_records_of_habit.assert_called_once_with(habit_name)
 
-        # Verify the correct streak is printed
-        mock_print.assert_any_call(f"Your Current Streak for {habit_name} is {current_streak}")
+    # Verify that get_current_streak_for_habit is called
+    user_interface.analytics.get_current_streak_for_habit.assert_called_once_with(habit_name)
 
-        # Verify final_menu is called
-        mock_final_menu.assert_called_once()
-        print("final_menu was called.")
+    # Verify the correct streak is printed
+    assert f"Your Current Streak for {habit_name} is {current_streak}" in printed
 
-        print("Test passed: Current streak for the habit was displayed correctly.")
-def test_show_longest_streak_for_given_habit(user_interface):
+    # Verify final_menu is called
+    mock_final_menu.assert_called_once()
+def test_show_longest_streak_for_given_habit(user_interface, monkeypatch, capsys, mock_final_menu):
     """Test the show_longest_streak_for_given_habit method to ensure the correct longest streak is displayed."""
     # Mock habit name and longest streak data
     habit_name = "meditation"
     longest_streak = 10  # Mocked longest streak value
 
     # Mock the required methods and behaviors
-    with patch.object(user_interface, "select_habit_name", return_value=habit_name), \
-         patch.object(user_interface.analytics, "get_longest_streak_for_given_habit", return_value=longest_streak), \
-         patch("builtins.print") as mock_print, \
-         patch.object(user_interface, "final_menu") as mock_final_menu:
-
-        # Call the show_longest_streak_for_given_habit method
-        user_interface.show_longest_streak_for_given_habit()
+    monkeypatch.setattr(user_interface, "select_habit_name", Mock(return_value=habit_name))
+    monkeypatch.setattr(user_interface, "analytics", stub_analytics(get_longest_streak_for_given_habit=longest_streak))
 
-        # Verify that select_habit_name is called
-        user_interface.select_habit_name.assert_called_once()
-        print("select_habit_name was called.")
+    # Call the show_longest_streak_for_given_habit method
+    user_interface.show_longest_streak_for_given_habit()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Verify that get_longest_streak_for_given_habit is called
-        user_interface.analytics.get_longest_streak_for_given_habit.assert_called_once_with(habit_name)
-        print("get_longest_streak_for_given_habit was called.")
+    # Verify that select_habit_name is called
+    user_interface.select_habit_name.assert_called_once()
 
-        # Verify the correct longest streak message is printed
-        mock_print.assert_any_call(f"The longest streak for {habit_name} is :", longest_streak)
+    # Verify that get_longest_streak_for_given_habit is called
+    user_interface.analytics.get_longest_streak_for_given_habit.assert_called_once_with(habit_name)
 
-        # Verify final_menu is called
-        mock_final_menu.assert_called_once()
-        print("final_menu was called.")
+    # Verify the correct longest streak message is printed
+    assert f"The longest streak for {habit_name} is : {longest_streak}" in printed
 
-        print("Test passed: Longest streak for the habit was displayed correctly.")
+    # Verify final_menu is called
+    mock_final_menu.assert_called_once()
 # Test for the exit_program method
-def test_exit_program(user_interface):
+def test_exit_program(user_interface, monkeypatch, capsys, mock_clear_screen):
     """Test the exit_program method to ensure it exits the program correctly."""
-    with patch("builtins.exit") as mock_exit, \
-         patch.object(user_interface, "clear_screen") as mock_clear_screen, \
-         patch("builtins.print") as mock_print:
+    mock_exit = Mock()
+    monkeypatch.setattr("builtins.exit", mock_exit)
 
-        # Call the exit_program method
-        user_interface.exit_program()
+    # Call the exit_program method
+    user_interface.exit_program()
+    printed = capsys.readouterr().out # Output of the method under test
 
-        # Ensure clear_screen was called
-        mock_clear_screen.assert_called_once()
+    # Ensure clear_screen was called
+    mock_clear_screen.assert_called_once()
 
-        # Ensure the exit message was printed
-        mock_print.assert_called_with("Exiting the program...")
+    # Ensure the exit message was printed
+    assert printed.endswith("Exiting the program...\n")
 
-        # Ensure exit() was called to exit the program
-        mock_exit.assert_called_once()
+    # Ensure exit() was called to exit the program
+    mock_exit.assert_called_once()
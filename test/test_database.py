@@ -1,6 +1,8 @@
 import pytest
 import sqlite3
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, timedelta
+from src.database import HabitTrackerDB
 # Helper class for mock habits
 class MockHabit:
     """
@@ -19,6 +21,15 @@ class MockHabit:
         self.periodicity = periodicity
         self.creation_date = creation_date
         self.creation_time = creation_time
+def last_month_range():
+    """
+    Return the first and last day of the previous calendar month.
+
+    Returns:
+        tuple: (first_day, last_day) as datetime.date objects.
+    """
+    last_day_of_last_month = date.today().replace(day=1) - timedelta(days=1)
+    return last_day_of_last_month.replace(day=1), last_day_of_last_month
 # Test inserting a new habit
 def test_insert_habit(habit_tracker_db):
     """
@@ -31,17 +42,36 @@ def test_insert_habit(habit_tracker_db):
         habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
     """
     new_habit = MockHabit("walking", "Daily walking habit", "daily", "2025-01-01", "06:30")
-    habit_tracker_db.insert_habit(new_habit)
+    assert habit_tracker_db.insert_habit(new_habit) is True, "A new habit should be reported as inserted."
+    assert habit_tracker_db.insert_habit(new_habit) is False, "A duplicate name should be reported as not inserted."
 
     # Verify the habit is in the database
-    cursor = habit_tracker_db.connection.cursor()
-    cursor.execute("SELECT * FROM habit WHERE name = ?", (new_habit.name,))
-    inserted_habit = cursor.fetchone()
+    inserted_habit = habit_tracker_db.connection.execute("SELECT * FROM habit WHERE name = ?", (new_habit.name,)).fetchone()
 
     assert inserted_habit is not None, "Habit should be inserted successfully."
     assert inserted_habit[1] == new_habit.name, "Habit name does not match."
     assert inserted_habit[2] == new_habit.description, "Habit description does not match."
     assert inserted_habit[3] == new_habit.periodicity, "Habit periodicity does not match."
+def test_insert_habits(habit_tracker_db):
+    """
+    Test inserting several habits in a single transaction.
+
+    This test ensures that all habits of a batch are inserted, and that a batch containing
+    a duplicate name is rolled back entirely.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+    """
+    new_habits = [
+        MockHabit("walking", "Daily walking habit", "daily", "2025-01-01", "06:30"),
+        MockHabit("journaling", "Weekly journaling habit", "weekly", "2025-01-02", "21:00"),
+    ]
+    habit_tracker_db.insert_habits(new_habits)
+    assert sorted(habit_tracker_db.get_all_habits_name()) == ["journaling", "walking"], "All habits of the batch should be inserted."
+
+    # A duplicate name makes the whole batch fail
+    habit_tracker_db.insert_habits([MockHabit("swimming", "Weekly swimming", "weekly", "2025-01-03", "07:00"), new_habits[0]])
+    assert not habit_tracker_db.habit_exists("swimming"), "No habit of a failed batch should be inserted."
 # Test fetching habit metadata
 def test_fetch_habit_metadata(habit_tracker_db, predefined_data):
     """
@@ -79,9 +109,38 @@ def test_insert_tracking_record(habit_tracker_db, predefined_data):
     habit_tracker_db.insert_tracking_record(habit_name, completion_date)
 
     # Verify the record is inserted
-    cursor = habit_tracker_db.connection.cursor()
-    cursor.execute("SELECT * FROM habit_completions WHERE habit_name = ? AND completion_date = ?", (habit_name, completion_date))
-    assert cursor.fetchone() is not None, "Tracking record should exist after insertion."
+    tracking_record = habit_tracker_db.connection.execute(
+        "SELECT * FROM habit_completions WHERE habit_name = ? AND completion_date = ?", (habit_name, completion_date)).fetchone()
+    assert tracking_record is not None, "Tracking record should exist after insertion."
+# Test inserting several tracking records at once
+def test_insert_tracking_records(habit_tracker_db, predefined_data):
+    """
+    Test inserting several tracking records in a single transaction.
+
+    This test ensures that all records of a batch are inserted, and that a batch containing
+    a duplicate completion date is rolled back entirely.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined data for testing.
+    """
+    new_records = [("exercise", "2024-12-09"), ("exercise", "2024-12-16")]
+    habit_tracker_db.insert_tracking_records(new_records)
+
+    completion_dates = habit_tracker_db.get_completion_dates_of_habit("exercise")
+    for _, completion_date in new_records:
+        assert completion_date in completion_dates, f"Tracking record {completion_date} should exist after insertion."
+
+    # A duplicate date makes the whole batch fail
+    habit_tracker_db.insert_tracking_records([("exercise", "2024-12-23"), ("exercise", "2024-12-09")])
+    assert "2024-12-23" not in habit_tracker_db.get_completion_dates_of_habit("exercise"), \
+        "No record of a failed batch should be inserted."
+
+    # With ignore_duplicates the new record is inserted and the duplicate skipped
+    habit_tracker_db.insert_tracking_records([("exercise", "2024-12-23"), ("exercise", "2024-12-09")], ignore_duplicates=True)
+    completion_dates = habit_tracker_db.get_completion_dates_of_habit("exercise")
+    assert "2024-12-23" in completion_dates
+    assert completion_dates.count("2024-12-09") == 1
 # Test checking habit existence
 def test_habit_exists(habit_tracker_db, predefined_data):
     """
@@ -133,8 +192,8 @@ def test_get_all_habits(habit_tracker_db, predefined_data):
     assert len(all_habits) == len(mock_habits), "Number of habits retrieved does not match predefined habits."
 
     # Verify that each habit exists in the retrieved list
-    for habit in mock_habits:
-        assert any(h[1] == habit.name for h in all_habits), f"Habit '{habit.name}' should exist in retrieved habits."
+    missing_habits = {habit.name for habit in mock_habits} - {h[1] for h in all_habits}
+    assert not missing_habits, f"Habits {missing_habits} should exist in retrieved habits."
 # Test retrieving all habit names
 def test_get_all_habits_name(habit_tracker_db, predefined_data):
     """
@@ -153,8 +212,8 @@ def test_get_all_habits_name(habit_tracker_db, predefined_data):
     assert len(all_habit_names) == len(mock_habits), "Number of habit names does not match predefined habits."
 
     # Verify that each habit name is in the retrieved list
-    for habit in mock_habits:
-        assert habit.name in all_habit_names, f"Habit name '{habit.name}' should be in the list of retrieved habit names."
+    missing_names = {habit.name for habit in mock_habits} - set(all_habit_names)
+    assert not missing_names, f"Habit names {missing_names} should be in the list of retrieved habit names."
 # Test updating an existing habit
 def test_update_habit(habit_tracker_db, predefined_data):
     """
@@ -176,9 +235,8 @@ def test_update_habit(habit_tracker_db, predefined_data):
     # Update the habit
     habit_tracker_db.update_habit(updated_habit)
     # Verify the update
-    cursor = habit_tracker_db.connection.cursor()
-    cursor.execute("SELECT description, periodicity FROM habit WHERE name = ?", (updated_habit.name,))
-    updated_data = cursor.fetchone()
+    updated_data = habit_tracker_db.connection.execute(
+        "SELECT description, periodicity FROM habit WHERE name = ?", (updated_habit.name,)).fetchone()
     assert updated_data == (updated_description, updated_periodicity), \
         f"Habit '{updated_habit.name}' should be updated with the new description and periodicity."
 # Test retrieving tracking records for a specific habit
@@ -230,6 +288,20 @@ def test_get_all_tracking_records(habit_tracker_db, predefined_data):
         assert (habit_name, completion_date) in extracted_records, (
             f"Tracking record ({habit_name}, {completion_date}) is missing from the database."
         )
+# Test iterating over all tracking records
+def test_iter_all_tracking_records(habit_tracker_db, predefined_data):
+    """
+    Test iterating over all tracking records in batches.
+
+    This test ensures that the iterator yields the same records as get_all_tracking_records,
+    even when the batch size is smaller than the number of records.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    records = list(habit_tracker_db.iter_all_tracking_records(batch_size=7))
+    assert records == habit_tracker_db.get_all_tracking_records(), "Iterated records do not match all tracking records."
 # Test fetching the creation date of a habit
 def test_get_creation_date_of_habit(habit_tracker_db, predefined_data):
     """
@@ -267,13 +339,126 @@ def test_get_completion_dates_of_habit(habit_tracker_db, predefined_data):
         [record[1] for record in predefined_tracking_data if record[0] == "exercise"]
     )
 
-    # Sort the fetched completion dates for a proper comparison
-    completion_dates = sorted(completion_dates)
-
-    # Verify the fetched completion dates match the expected dates
+    # Verify the fetched completion dates match the expected dates and are already sorted
     assert completion_dates == expected_dates, (
         f"Expected completion dates: {expected_dates}, but got: {completion_dates}"
     )
+
+    # Verify the completion dates can be fetched most recent first
+    descending_dates = habit_tracker_db.get_completion_dates_of_habit("exercise", descending=True)
+    assert descending_dates == expected_dates[::-1], (
+        f"Expected completion dates: {expected_dates[::-1]}, but got: {descending_dates}"
+    )
+
+    # The iterator yields the same dates one at a time
+    completion_dates_iterator = habit_tracker_db.iter_completion_dates_of_habit("exercise")
+    assert next(completion_dates_iterator) == expected_dates[0]
+    assert list(completion_dates_iterator) == expected_dates[1:]
+    assert list(habit_tracker_db.iter_completion_dates_of_habit("nonexistent")) == []
+# Test retrieving the completion dates of a habit as day ordinals
+def test_get_completion_ordinals_of_habit(habit_tracker_db, predefined_data):
+    """
+    Test retrieving the completion dates of a habit as integer day ordinals.
+
+    This test ensures that the ordinals computed by SQLite match `date.toordinal()` of the
+    predefined completion dates, in both sort orders.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    _, predefined_tracking_data = predefined_data
+    expected_ordinals = sorted(
+        date.fromisoformat(completion_date).toordinal()
+        for habit_name, completion_date in predefined_tracking_data if habit_name == "exercise"
+    )
+
+    assert habit_tracker_db.get_completion_ordinals_of_habit("exercise") == expected_ordinals
+    assert habit_tracker_db.get_completion_ordinals_of_habit("exercise", descending=True) == expected_ordinals[::-1]
+    assert habit_tracker_db.get_completion_ordinals_of_habit("nonexistent") is None
+# Test fetching the periodicities of all habits in one query
+def test_get_all_habit_periodicities(habit_tracker_db, predefined_data):
+    """
+    Test retrieving the periodicity of every habit in a single call.
+
+    This test ensures that the returned mapping contains each predefined habit with its periodicity.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined data for testing.
+    """
+    mock_habits, _ = predefined_data
+    habit_periodicities = habit_tracker_db.get_all_habit_periodicities()
+
+    expected_periodicities = {habit.name: habit.periodicity for habit in mock_habits}
+    assert habit_periodicities == expected_periodicities, "Habit periodicities do not match predefined data."
+# Test fetching the completion dates of all habits in one query
+def test_get_all_completion_dates(habit_tracker_db, predefined_data):
+    """
+    Test retrieving the completion dates of every habit in a single call.
+
+    This test ensures that the completion dates are grouped by habit name and sorted in ascending order.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    all_completion_dates = habit_tracker_db.get_all_completion_dates()
+
+    # Group the predefined tracking data by habit name
+    _, predefined_tracking_data = predefined_data
+    expected_completion_dates = {}
+    for habit_name, completion_date in predefined_tracking_data:
+        expected_completion_dates.setdefault(habit_name, []).append(completion_date)
+    for habit_name in expected_completion_dates:
+        expected_completion_dates[habit_name].sort()
+
+    assert all_completion_dates == expected_completion_dates, (
+        f"Expected completion dates: {expected_completion_dates}, but got: {all_completion_dates}"
+    )
+# Test calculating daily streaks inside the database
+def test_get_longest_daily_streak(habit_tracker_db, predefined_data):
+    """
+    Test calculating the longest daily streak of a habit with a SQL query.
+
+    This test ensures that the longest run of consecutive days matches the predefined data
+    and that a habit without completion dates has a streak of 0.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    assert habit_tracker_db.get_longest_daily_streak("meditation") == 6, "Longest streak for 'meditation' should be 6."
+    assert habit_tracker_db.get_longest_daily_streak("coding") == 7, "Longest streak for 'coding' should be 7."
+    assert habit_tracker_db.get_longest_daily_streak("nonexistent") == 0, "A habit without completions should have a streak of 0."
+def test_get_longest_daily_streaks(habit_tracker_db, predefined_data):
+    """
+    Test calculating the longest daily streak of every habit with a single SQL query.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    longest_daily_streaks = habit_tracker_db.get_longest_daily_streaks()
+    assert longest_daily_streaks == {
+        habit_name: habit_tracker_db.get_longest_daily_streak(habit_name)
+        for habit_name in habit_tracker_db.get_all_completion_dates()
+    }, "The bulk streaks should match the streak of each habit."
+    assert longest_daily_streaks["meditation"] == 6, "Longest streak for 'meditation' should be 6."
+def test_get_current_daily_streak(habit_tracker_db, predefined_data):
+    """
+    Test calculating the current daily streak of a habit with a SQL query.
+
+    This test ensures that the streak ending at the most recent completion matches the predefined data
+    and that a habit without completion dates has a streak of 0.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    assert habit_tracker_db.get_current_daily_streak("meditation") == 3, "Current streak for 'meditation' should be 3."
+    assert habit_tracker_db.get_current_daily_streak("water intake") == 5, "Current streak for 'water intake' should be 5."
+    assert habit_tracker_db.get_current_daily_streak("nonexistent") == 0, "A habit without completions should have a streak of 0."
 # Test deleting tracking records of a habit
 def test_delete_tracking_records_of_habit(habit_tracker_db, predefined_data):
     """
@@ -286,13 +471,17 @@ def test_delete_tracking_records_of_habit(habit_tracker_db, predefined_data):
         predefined_data (Mock): A fixture providing predefined data for testing.
     """
     habit_name = "meditation"
+    initial_records = habit_tracker_db.get_tracking_records_of_habit(habit_name)
     # Perform the deletion of the tracking records
-    habit_tracker_db.delete_tracking_records_of_habit(habit_name)
+    deleted = habit_tracker_db.delete_tracking_records_of_habit(habit_name)
+    assert deleted == len(initial_records), "The number of deleted records should be returned."
 
 
     # Verify that the tracking records have been deleted
     final_records = habit_tracker_db.get_tracking_records_of_habit(habit_name)
     assert final_records == [], f"All tracking records for '{habit_name}' should be deleted."
+    # Deleting again finds nothing
+    assert habit_tracker_db.delete_tracking_records_of_habit(habit_name) == 0
     habit_tracker_db, predefined_data
 # Test deleting a habit from the database
 def test_delete_habit(habit_tracker_db, predefined_data):
@@ -387,13 +576,8 @@ def test_get_habit_completions_last_month(habit_tracker_db, predefined_data):
         habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
         predefined_data (Mock): A fixture providing predefined tracking data for testing.
     """
-    # Get today's date to calculate the date range for the previous month
-    today = datetime.today().date()
-
     # Calculate the first and last day of the previous month
-    first_day_of_current_month = today.replace(day=1)
-    last_day_of_last_month = first_day_of_current_month - timedelta(days=1)
-    first_day_of_last_month = last_day_of_last_month.replace(day=1)
+    first_day_of_last_month, last_day_of_last_month = last_month_range()
 
     # Fetch habit completions from the previous calendar month
     completions = habit_tracker_db.get_habit_completions_last_month()
@@ -403,14 +587,180 @@ def test_get_habit_completions_last_month(habit_tracker_db, predefined_data):
     expected_completions = [
         (record[0], record[1])
         for record in predefined_tracking_data
-        if first_day_of_last_month <= datetime.strptime(record[1], "%Y-%m-%d").date() <= last_day_of_last_month
+        if first_day_of_last_month <= date.fromisoformat(record[1]) <= last_day_of_last_month
     ]
 
-    # Sort both the fetched and expected results for consistent comparison
-    completions = sorted(completions, key=lambda x: (x[0], x[1]))
-    expected_completions = sorted(expected_completions, key=lambda x: (x[0], x[1]))
-
-    # Assert that the fetched completions match the expected completions
-    assert completions == expected_completions, (
+    # Without completions in the previous month the method returns None
+    if not expected_completions:
+        assert completions is None, f"Expected None, but got: {completions}"
+        return
+    # Assert that the fetched completions match the expected completions, ignoring order
+    assert Counter(completions) == Counter(expected_completions), (
         f"Expected completions: {expected_completions}, but got: {completions}"
     )
+# Test counting habit completions from the previous calendar month
+def test_count_habit_completions_last_month(habit_tracker_db, predefined_data):
+    """
+    Test counting the completions of each habit in the previous calendar month.
+
+    This test checks that the GROUP BY query returns the same counts as counting the
+    predefined tracking data of the previous month, or None if there are none.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined tracking data for testing.
+    """
+    # Calculate the first and last day of the previous month
+    first_day_of_last_month, last_day_of_last_month = last_month_range()
+
+    # Count the expected completions per habit from predefined data
+    _, predefined_tracking_data = predefined_data
+    expected_counts = {}
+    for habit_name, completion_date in predefined_tracking_data:
+        if first_day_of_last_month <= date.fromisoformat(completion_date) <= last_day_of_last_month:
+            expected_counts[habit_name] = expected_counts.get(habit_name, 0) + 1
+
+    completion_counts = habit_tracker_db.count_habit_completions_last_month()
+
+    if expected_counts:
+        assert dict(completion_counts) == expected_counts, (
+            f"Expected completion counts: {expected_counts}, but got: {completion_counts}"
+        )
+    else:
+        assert completion_counts is None, "Without completions in the last month the result should be None."
+def test_transaction(habit_tracker_db, predefined_data):
+    """
+    Test grouping several database methods into one transaction.
+
+    This test checks that statements run inside `transaction()` are committed together,
+    and that all of them are rolled back if the block raises.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined data for testing.
+    """
+    # A failing block rolls back the nested deletes
+    with pytest.raises(RuntimeError):
+        with habit_tracker_db.transaction():
+            habit_tracker_db.delete_tracking_records_of_habit("meditation")
+            habit_tracker_db.delete_habit("meditation")
+            raise RuntimeError("abort")
+    assert habit_tracker_db.habit_exists("meditation"), "The habit should be restored by the rollback."
+    assert habit_tracker_db.get_tracking_records_of_habit("meditation"), "The tracking records should be restored by the rollback."
+
+    # A successful block commits both deletes
+    with habit_tracker_db.transaction():
+        habit_tracker_db.delete_tracking_records_of_habit("meditation")
+        habit_tracker_db.delete_habit("meditation")
+    assert not habit_tracker_db.habit_exists("meditation"), "The habit should be deleted."
+    assert habit_tracker_db.get_tracking_records_of_habit("meditation") == [], "The tracking records should be deleted."
+def test_transaction_rolls_back_failed_statement(habit_tracker_db, predefined_data):
+    """
+    Test that a statement failing inside a database method rolls back the whole transaction.
+
+    The database methods print and swallow their errors, so the failure has to be re-raised
+    by the outer `transaction()` block for the earlier statements to be undone.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined data for testing.
+    """
+    mock_habits, _ = predefined_data
+    with pytest.raises(sqlite3.IntegrityError):
+        with habit_tracker_db.transaction():
+            habit_tracker_db.delete_tracking_records_of_habit("meditation")
+            habit_tracker_db.insert_habit(mock_habits[0]) # Duplicate name, fails inside insert_habit
+    assert habit_tracker_db.get_tracking_records_of_habit("meditation"), "The tracking records should be restored by the rollback."
+
+    # The next transaction starts clean and commits
+    with habit_tracker_db.transaction():
+        habit_tracker_db.delete_tracking_records_of_habit("meditation")
+    assert habit_tracker_db.get_tracking_records_of_habit("meditation") == [], "The tracking records should be deleted."
+def test_seeding_in_transaction_is_all_or_nothing(habit_tracker_db):
+    """
+    Test that seeding habits and tracking records in one transaction, as `predefined_data` does,
+    raises on a bad row and leaves nothing inserted.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+    """
+    with pytest.raises(sqlite3.IntegrityError):
+        with habit_tracker_db.transaction():
+            habit_tracker_db.insert_habits([MockHabit("exercise", "Weekly exercise habit", "weekly", "2024-11-01", "08:00")])
+            # The second record repeats the first one, violating UNIQUE (habit_name, completion_date)
+            habit_tracker_db.insert_tracking_records([("exercise", "2024-11-05"), ("exercise", "2024-11-05")])
+    assert habit_tracker_db.get_all_habits() == [], "No habit should be seeded when a record fails."
+def test_configure_connection_journal_mode(tmp_path, habit_tracker_db):
+    """
+    Test that WAL journal mode is enabled only for file-backed databases.
+
+    Args:
+        tmp_path (Path): A pytest fixture providing a temporary directory.
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+    """
+    file_db = HabitTrackerDB(connection=sqlite3.connect(tmp_path / "habit_tracker.db"))
+    # A second connection keeps SQLite from removing the WAL file by itself when file_db closes
+    other_connection = sqlite3.connect(tmp_path / "habit_tracker.db")
+    try:
+        assert file_db.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert file_db.connection.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert file_db.connection.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        file_db.insert_habit(MockHabit("walking", "Daily walking habit", "daily", "2025-01-01", "06:30"))
+        other_connection.execute("SELECT 1 FROM habit").fetchall()
+    finally:
+        file_db.close()
+
+    # Closing checkpoints the WAL journal into the database file and truncates it
+    try:
+        assert (tmp_path / "habit_tracker.db-wal").stat().st_size == 0, "The WAL journal should be checkpointed on close."
+    finally:
+        other_connection.close()
+
+    # The in-memory test database keeps its memory journal
+    assert habit_tracker_db.connection.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+def test_indexes_used_by_queries(habit_tracker_db):
+    """
+    Test that the date-range and periodicity queries search an index instead of scanning a table.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+    """
+    connection = habit_tracker_db.connection
+    plan = connection.execute(
+        "EXPLAIN QUERY PLAN SELECT habit_name, completion_date FROM habit_completions WHERE completion_date BETWEEN ? AND ?",
+        ("2024-11-01", "2024-11-30")).fetchall()
+    assert "idx_habit_completions_date" in plan[0][3], f"Unexpected query plan: {plan}"
+
+    plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM habit WHERE periodicity = ?", ("daily",)).fetchall()
+    assert "idx_habit_periodicity" in plan[0][3], f"Unexpected query plan: {plan}"
+def test_foreign_keys(habit_tracker_db, predefined_data):
+    """
+    Test that tracking records are tied to an existing habit.
+
+    This test ensures that deleting a habit also deletes its tracking records, and that
+    a tracking record cannot be added for a habit that does not exist.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+        predefined_data (Mock): A fixture providing predefined data for testing.
+    """
+    habit_tracker_db.delete_habit("coding")
+    assert habit_tracker_db.get_tracking_records_of_habit("coding") == [], "Deleting a habit should cascade to its tracking records."
+
+    habit_tracker_db.insert_tracking_record("nonexistent", "2024-12-01")
+    assert habit_tracker_db.get_tracking_records_of_habit("nonexistent") == [], "Records of unknown habits should be rejected."
+def test_db_path_resolution(habit_tracker_db):
+    """
+    Test that the database file path is only resolved when HabitTrackerDB opens a file itself.
+
+    Args:
+        habit_tracker_db (Mock): A mock instance of the HabitTrackerDB used to simulate database interactions.
+    """
+    assert habit_tracker_db.db_path is None, "An injected connection needs no file path."
+
+    memory_db = HabitTrackerDB(db_name=":memory:")
+    try:
+        assert memory_db.db_path == ":memory:"
+        assert memory_db.get_all_habits_name() == []
+    finally:
+        memory_db.close()
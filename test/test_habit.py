@@ -1,74 +1,86 @@
 import pytest
 from src.habit import Habit
-from unittest.mock import Mock
-class TestHabit:
-    def test_add_habit(self, habit_tracker_db):
-        """
-        Test adding a new habit to the database.
+from unittest.mock import create_autospec
+from src.database import HabitTrackerDB
+@pytest.mark.parametrize("action, habit_data, assertion", [
+    # A new habit is stored with its description and periodicity
+    pytest.param(
+        "add_habit",
+        {"name": "running", "description": "Daily running habit", "periodicity": "daily",
+         "creation_date": "2025-01-10", "creation_time": "07:00"},
+        lambda db, habit: db.habit_exists(habit.name)
+        and db.fetch_habit_metadata(habit.name) == (habit.description, habit.periodicity),
+        id="add-running",
+    ),
+    # A modified habit keeps its name but gets the new description and periodicity
+    pytest.param(
+        "modify_habit",
+        {"name": "meditation", "description": "Updated meditation habit", "periodicity": "weekly"},
+        lambda db, habit: db.fetch_habit_metadata(habit.name) == (habit.description, habit.periodicity),
+        id="modify-meditation",
+    ),
+    # A removed habit is no longer in the database
+    pytest.param(
+        "remove_habit",
+        {"name": "reading", "description": "Weekly reading habit", "periodicity": "weekly"},
+        lambda db, habit: db.habit_exists(habit.name) is False,
+        id="remove-reading",
+    ),
+    # Adding a habit under an existing name leaves the stored habit unchanged
+    pytest.param(
+        "add_habit",
+        {"name": "meditation", "description": "Another meditation habit", "periodicity": "weekly"},
+        lambda db, habit: db.fetch_habit_metadata(habit.name) == ("Daily meditation habit", "daily"),
+        id="add-duplicate-meditation",
+    ),
+    # Modifying a habit that is not in the database does not create it
+    pytest.param(
+        "modify_habit",
+        {"name": "swimming", "description": "Daily swimming habit", "periodicity": "daily"},
+        lambda db, habit: db.habit_exists(habit.name) is False,
+        id="modify-missing-swimming",
+    ),
+    # Removing a habit that is not in the database leaves the other habits in place
+    pytest.param(
+        "remove_habit",
+        {"name": "swimming", "description": "Daily swimming habit", "periodicity": "daily"},
+        lambda db, habit: db.habit_exists("reading") and db.habit_exists(habit.name) is False,
+        id="remove-missing-swimming",
+    ),
+])
+def test_habit_crud(habit_tracker_db, predefined_data, action, habit_data, assertion):
+    """
+    Test adding, modifying and removing a habit in the database.
 
-        This test ensures that when a new habit is added, it is properly 
-        stored in the database with the correct metadata.
-        
-        Args:
-            habit_tracker_db (Mock): A mock instance of the HabitTrackerDB.
-        """
-        # Create a new habit object
-        new_habit = Habit(
-            name="running",
-            description="Daily running habit",
-            periodicity="daily",
-            creation_date="2025-01-10",
-            creation_time="07:00",
-            database=habit_tracker_db
-        )
+    Each case builds a `Habit`, runs one of its database actions and checks the
+    stored state afterwards, including actions on duplicate or missing habits,
+    which must leave the database unchanged.
 
-        new_habit.add_habit()
+    Args:
+        habit_tracker_db (HabitTrackerDB): The in-memory database fixture.
+        predefined_data (Mock): A mock fixture providing predefined habits to modify or remove.
+        action (str): Name of the `Habit` method to call.
+        habit_data (dict): Keyword arguments used to create the habit.
+        assertion (callable): Check run against the database and the habit after the action.
+    """
+    habit = Habit(**habit_data, database=habit_tracker_db)
 
-        # Retrieve the habit from the database to validate it was added
-        assert habit_tracker_db.habit_exists("running") is not None, "Habit was not added to the database."
-        assert habit_tracker_db.fetch_habit_metadata("running") == (new_habit.description , new_habit.periodicity)
-    def test_modify_habit(self, habit_tracker_db, predefined_data):
-        """
-        Test modifying an existing habit in the database.
+    getattr(habit, action)()
 
-        This test ensures that when a habit's details are modified, the changes
-        are correctly reflected in the database, without altering the habit's name.
+    assert assertion(habit_tracker_db, habit), f"{action} did not update the database as expected."
+def test_default_database_is_shared(monkeypatch):
+    """
+    Test that habits created without a database share one lazily created instance.
 
-        Args:
-            habit_tracker_db (Mock): A mock instance of the HabitTrackerDB.
-            predefined_data (Mock): A mock fixture providing predefined habits for modification.
-        """
-        # Create a habit to modify
-        habit_to_modify = Habit(
-            name="meditation",
-            description="Updated meditation habit",
-            periodicity="weekly",
-            database=habit_tracker_db
-        )
-        # Modify the habit's description and periodicity
-        habit_to_modify.modify_habit()
-       # Retrieve the habit from the database to validate the modifications
-        assert habit_tracker_db.fetch_habit_metadata("meditation") == (habit_to_modify.description , habit_to_modify.periodicity)
-    def test_remove_habit(self, habit_tracker_db, predefined_data):
-        """
-        Test removing a habit from the database.
+    Args:
+        monkeypatch (MonkeyPatch): A pytest fixture used to replace the database class.
+    """
+    mock_db_class = create_autospec(HabitTrackerDB)
+    monkeypatch.setattr("src.habit.HabitTrackerDB", mock_db_class)
+    monkeypatch.setattr("src.habit._default_db", None)
 
-        This test ensures that when a habit is removed, it is no longer present
-        in the database.
+    first_habit = Habit(name="running", description="Daily running habit", periodicity="daily")
+    second_habit = Habit(name="walking", description="Daily walking habit", periodicity="daily")
 
-        Args:
-            habit_tracker_db (Mock): A mock instance of the HabitTrackerDB.
-            predefined_data (Mock): A mock fixture providing predefined habits for removal.
-        """
-        # Create a habit to remove
-        habit_to_remove = Habit(
-            name="reading",
-            description="Weekly reading habit",
-            periodicity="weekly",
-            database=habit_tracker_db
-        )
-        # Remove the habit from the database
-        habit_to_remove.remove_habit()
-        # Verify the habit was successfully removed
-        removed_habit = habit_tracker_db.habit_exists("reading")
-        assert removed_habit is False, "Habit was not removed from the database."
+    assert first_habit.db is second_habit.db
+    mock_db_class.assert_called_once_with()
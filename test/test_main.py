@@ -1,31 +1,25 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, call, DEFAULT
 from src.main import main
 
-@patch("src.main.HabitTrackerDB")
-@patch("src.main.UserInterface")
-def test_main_flow(mock_ui_class, mock_db_class):
+def test_main_flow():
     """
     Test the main function by mocking the HabitTrackerDB and UserInterface classes.
     Ensures that the main flow initializes the database, passes it to the UI,
-    runs the UI, and properly closes the database.
-
-    Args:
-        mock_ui_class (MagicMock): Mocked class for UserInterface.
-        mock_db_class (MagicMock): Mocked class for HabitTrackerDB.
+    runs the UI, and properly closes the database, in that order.
     """
-    # Mock the HabitTrackerDB instance to simulate the database behavior
-    mock_db_instance = MagicMock()
-    mock_db_class.return_value = mock_db_instance
-
-    # Mock the UserInterface instance to simulate the UI behavior
-    mock_ui_instance = MagicMock()
-    mock_ui_class.return_value = mock_ui_instance
+    with patch.multiple("src.main", HabitTrackerDB=DEFAULT, UserInterface=DEFAULT) as mock_classes:
+        # Attach both mocked classes to one parent so their calls are recorded in a single, ordered log
+        parent = MagicMock()
+        parent.attach_mock(mock_classes["HabitTrackerDB"], "DB")
+        parent.attach_mock(mock_classes["UserInterface"], "UI")
 
-    # Run the main function, which is the entry point for the application
-    main()
+        # Run the main function, which is the entry point for the application
+        main()
 
-    # Assertions to verify correct behavior:
-    mock_db_class.assert_called_once()  # Ensure HabitTrackerDB was instantiated once
-    mock_ui_class.assert_called_once_with(mock_db_instance)   # Ensure UI was initialized with the mocked DB instance
-    mock_ui_instance.run.assert_called_once()  # Ensure the UI's 'run' method was called once
-    mock_db_instance.close.assert_called_once() # Ensure the DB's 'close' method was called to clean up
+    # The DB is created, passed to the UI, the UI is run and the DB is closed to clean up
+    assert parent.mock_calls == [
+        call.DB(),
+        call.UI(parent.DB.return_value),
+        call.UI().run(),
+        call.DB().close(),
+    ]